@@ -0,0 +1,208 @@
+"""Benchmark the website generator on synthetic catalogs
+
+    python benchmark.py                      # 100, 10k and 100k products
+    python benchmark.py --sizes 100 10000 --stages create_index_page
+
+Every stage runs in a fresh subprocess so peak RSS is per stage; the
+incremental stage rebuilds after a one-row price change, with the full build
+before it run in a subprocess of its own. Results are
+appended to .cache/bench/results.jsonl together with the git commit, and each
+run is compared with the latest result recorded for another commit.
+"""
+import os
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import resource
+import subprocess
+import contextlib
+
+import final_website_complete as site
+
+BENCH_FOLDER = os.path.join('.cache', 'bench')
+RESULTS_FILE = os.path.join(BENCH_FOLDER, 'results.jsonl')
+DEFAULT_SIZES = [100, 10000, 100000]
+STAGES = ['create_styles', 'create_index_page', 'create_product_page', 'create_qr_codes',
+          'create_final_website', 'create_final_website --incremental']
+# Stages handed a parsed catalog; the others read products.csv themselves
+PRODUCT_STAGES = ['create_index_page', 'create_product_page', 'create_qr_codes']
+
+NAME_WORDS = ['Kilishi', 'Chin Chin', 'Small Chops', 'Mocktail', 'Cocktail', 'Smoothie', 'Egg Roll',
+              'Puff Puff', 'Meat Pie', 'Sausage Roll', 'Plantain Chips', 'Zobo', 'Red Velvet Cake',
+              'Banana Bread', 'Doughnut', 'Cupcake', 'Fish Roll', 'Coconut Candy', 'Tiger Nut Drink']
+SIZE_WORDS = ['Mini', 'Small', 'Medium', 'Large', 'Party Pack', 'Family Size', '1kg', '500g']
+DESCRIPTION_WORDS = ['spicy', 'sweet', 'crunchy', 'fresh', 'homemade', 'one pack', 'chilled', 'baked',
+                     'fried', 'with pepper', 'no sugar', 'party size', 'vanilla', 'chocolate', 'pineapple']
+MANUFACTURERS = ["Saph's cakes and more", 'Lagos Island Bakery', 'Idiomo Kitchen']
+
+def synthesize_catalog(size, path, seed=2024):
+    """Write a deterministic products.csv with size rows in the real schema"""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(site.PRODUCT_COLUMNS)
+        for number in range(size):
+            product_id = 100 + number
+            name = f"{rng.choice(NAME_WORDS)} ({rng.choice(SIZE_WORDS)})"
+            description = ' '.join(rng.sample(DESCRIPTION_WORDS, rng.randint(2, 6)))
+            writer.writerow([
+                product_id, name, f"₦{rng.randrange(200, 60000, 50)}", description,
+                rng.choice(MANUFACTURERS), f"https://images.example.invalid/{product_id}.jpg",
+                '@saphcakes_ndmore'
+            ])
+
+def catalog_path(size):
+    path = os.path.join(BENCH_FOLDER, f"catalog-{size}.csv")
+    if not os.path.exists(path):
+        os.makedirs(BENCH_FOLDER, exist_ok=True)
+        synthesize_catalog(size, path)
+    return path
+
+def change_one_price(path):
+    """Raise the price of the middle row of a catalog by ₦50"""
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    row = rows[(len(rows) + 1) // 2]
+    price = row[site.PRODUCT_COLUMNS.index('price')]
+    row[site.PRODUCT_COLUMNS.index('price')] = f"₦{int(price.lstrip('₦')) + 50}"
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+
+def snapshot(folder):
+    """(size, mtime) of every file under folder"""
+    files = {}
+    for root, dirs, names in os.walk(folder):
+        for name in names:
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            files[path] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+def peak_rss_mb():
+    """Peak RSS of this process and its finished children, in MB"""
+    unit = 1 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(own, children) * unit / 2 ** 20, 1)
+
+def run_stage(stage, catalog, workdir):
+    """Run one stage inside workdir and measure it (called in a subprocess)"""
+    os.chdir(workdir)
+    folder = 'docs'
+    os.makedirs(folder, exist_ok=True)
+    with open(catalog, encoding='utf-8') as source, open('products.csv', 'w', encoding='utf-8') as target:
+        target.write(source.read())
+    options = {'images': False}
+
+    if stage == 'create_final_website --incremental':
+        # measure() ran the full build in its own process beforehand
+        change_one_price('products.csv')
+    products = list(site.read_products('products.csv')) if stage in PRODUCT_STAGES else None
+    before = snapshot(folder)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        if stage == 'create_styles':
+            site.create_styles(folder)
+        elif stage == 'create_index_page':
+            site.create_index_page(products, folder)
+        elif stage == 'create_product_page':
+            for position, product in enumerate(products):
+                others = site.get_other_products(product, products, position)
+                site.create_product_page(product, folder, products, others)
+        elif stage == 'create_qr_codes':
+            site.create_qr_codes(products, folder, cache_folder=os.path.join(workdir, 'qr-cache'))
+        elif stage == 'create_final_website':
+            site.create_final_website(**options)
+        elif stage == 'create_final_website --incremental':
+            site.create_final_website(incremental=True, **options)
+        else:
+            raise ValueError(f"Unknown stage: {stage}")
+    seconds = time.perf_counter() - start
+
+    after = snapshot(folder)
+    changed = [path for path, stat in after.items() if before.get(path) != stat]
+    return {
+        'seconds': round(seconds, 4),
+        'peak_rss_mb': peak_rss_mb(),
+        'files_written': len(changed),
+        'bytes_written': sum(after[path][0] for path in changed)
+    }
+
+def measure(stage, size):
+    """Run a stage on a catalog size in a fresh interpreter"""
+    catalog = os.path.abspath(catalog_path(size))
+    with tempfile.TemporaryDirectory(prefix='bench-') as workdir:
+        if stage == 'create_final_website --incremental':
+            run_child('create_final_website', catalog, workdir, size)
+        return run_child(stage, catalog, workdir, size)
+
+def run_child(stage, catalog, workdir, size):
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', stage, catalog, workdir],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{stage} on {size} products failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def load_results():
+    try:
+        with open(RESULTS_FILE, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+def run_benchmarks(sizes, stages):
+    """Benchmark every stage on every catalog size and record the results"""
+    commit = git_commit()
+    previous = {}
+    for result in load_results():
+        if result['commit'] != commit:
+            previous[(result['stage'], result['size'])] = result
+
+    print(f"⏱️ Benchmarking commit {commit} on {os.cpu_count()} CPUs")
+    print(f"{'stage':38} {'products':>9} {'seconds':>9} {'vs prev':>8} {'peak MB':>8} {'files':>7} {'MB written':>10}")
+    os.makedirs(BENCH_FOLDER, exist_ok=True)
+    for size in sizes:
+        for stage in stages:
+            result = {
+                'commit': commit,
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'cpus': os.cpu_count(),
+                'stage': stage,
+                'size': size,
+                **measure(stage, size)
+            }
+            with open(RESULTS_FILE, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(result, sort_keys=True) + '\n')
+
+            baseline = previous.get((stage, size))
+            change = f"{result['seconds'] / baseline['seconds'] - 1:+.0%}" if baseline and baseline['seconds'] else ''
+            print(f"{stage:38} {size:>9} {result['seconds']:>9.3f} {change:>8} {result['peak_rss_mb']:>8.1f} "
+                  f"{result['files_written']:>7} {result['bytes_written'] / 1e6:>10.2f}")
+    print(f"\n📊 Results appended to {RESULTS_FILE}")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == '--child':
+        print(json.dumps(run_stage(*sys.argv[2:])))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Benchmark the website generator on synthetic catalogs")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="catalog sizes to generate")
+    parser.add_argument('--stages', nargs='+', default=STAGES, choices=STAGES, help="stages to run")
+    args = parser.parse_args()
+    run_benchmarks(args.sizes, args.stages)
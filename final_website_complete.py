@@ -1,6 +1,46 @@
-import pandas as pd
 import qrcode
 import os
+import sys
+import ast
+import argparse
+import re
+import csv
+import json
+import unicodedata
+import io
+import shutil
+import gzip
+import zlib
+import html
+import hashlib
+import itertools
+import bisect
+from array import array
+import inspect
+import time
+import cProfile
+import pstats
+import tracemalloc
+import contextlib
+import asyncio
+import ssl
+import threading
+import functools
+import http.server
+import urllib.request
+import urllib.error
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # BUSINESS INFORMATION
 BUSINESS_INFO = {
@@ -17,103 +57,860 @@ BUSINESS_INFO = {
     'payment_methods': 'Cash, Bank Transfer, and Installment Payment Available'
 }
 
-def create_final_website():
-    """Create the final website with ALL features"""
-    
-    print("🎯 CREATING COMPLETE WEBSITE WITH ALL FEATURES")
-    print("=" * 60)
-    
+# CATALOG COLUMNS
+PRODUCT_COLUMNS = ('product_id', 'product_name', 'price', 'description',
+                   'manufacturer', 'image_url', 'instagram_handle')
+
+# BUILD SETTINGS
+MANIFEST_FILENAME = '.build-manifest.json'
+MANIFEST_VERSION = 1
+CATALOG_SNAPSHOT_FOLDER = os.path.join('.cache', 'catalog')
+CATALOG_SNAPSHOT_VERSION = 1
+BUILD_REPORT_FILE = 'build-report.json'
+BUILD_PROFILE_FILE = 'build-profile.prof'
+OTHER_PRODUCTS_LIMIT = 6
+CATALOG_FILE = 'products.csv'
+STORES_FILE = 'stores.json'
+SITE_URL = 'https://saphcakes.github.io/product-qr-system/'
+
+# INDEX PAGE SETTINGS
+# mode 'single' puts every product on index.html, 'pages' splits the catalog
+# into numbered products-<n>.html pages, 'shards' writes JSON shards under
+# catalog/ that index.html fetches as the customer scrolls.
+INDEX_SETTINGS = {
+    'mode': 'pages',
+    'page_size': 60,
+    'shard_size': 120
+}
+
+# SEARCH SETTINGS
+# Terms are sharded by their first prefix_length characters and product
+# details by blocks of doc_block_size, so a query only fetches a few files.
+SEARCH_SETTINGS = {
+    'folder': 'search',
+    'prefix_length': 2,
+    'doc_block_size': 500,
+    'max_results': 20
+}
+
+# BROWSE SETTINGS
+# Pre-sorted listings written as browse-<view>.html: cheapest and dearest
+# first, one per price band (limits in naira) and one per manufacturer,
+# split into pages of page_size products.
+BROWSE_SETTINGS = {
+    'enabled': True,
+    'price_bands': [1000, 3000, 5000, 10000, 20000],
+    'page_size': 60
+}
+
+# OFFLINE SETTINGS
+# sw.js precaches the core pages, the stylesheet and the first
+# precache_qr_codes QR codes, keyed by a hash of the files in docs/.
+# Other pages are cached as they are visited (network first, cache after
+# network_timeout ms), keeping the page_cache_entries most recently used.
+# Product photos are cache first: image_cache_entries for photos served
+# from docs/ or with CORS, and far fewer opaque cross-origin photos, which
+# browsers count as several MB each against the storage quota.
+OFFLINE_SETTINGS = {
+    'enabled': True,
+    'service_worker': 'sw.js',
+    'manifest': 'precache-manifest.json',
+    'core_pages': ['index.html', 'about.html', 'contact.html'],
+    'precache_qr_codes': 60,
+    'page_cache_entries': 50,
+    'image_cache_entries': 150,
+    'opaque_image_cache_entries': 20,
+    'network_timeout': 3000
+}
+
+# ASSET SETTINGS
+# Post-processing of docs/: minified HTML/CSS, a content-hashed stylesheet
+# name and precompressed .gz/.br siblings (.br needs the brotli package).
+# Brotli quality 9 compresses about four times faster than 11 for a few
+# percent larger pages.
+# critical_css inlines the rules each page uses into its <head>; the full
+# stylesheet is then loaded without blocking ('async') or not at all ('none').
+ASSET_SETTINGS = {
+    'minify': True,
+    'fingerprint': True,
+    'critical_css': True,
+    'full_stylesheet': 'async',
+    'compress': True,
+    'gzip_level': 9,
+    'brotli_quality': 9,
+    'compress_min_bytes': 512
+}
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg', '.xml', '.txt')
+# Files earlier versions wrote to docs/ without recording them in the manifest
+LEGACY_OUTPUTS = ('styles.css',)
+
+# QR CODE SETTINGS
+# format 'png' writes qr-<id>.png, 'svg' writes vector qr-<id>.svg files.
+QR_SETTINGS = {
+    'format': 'png',
+    'error_correction': 'M',
+    'box_size': 10,
+    'border': 4
+}
+QR_CACHE_FOLDER = os.path.join('.cache', 'qr')
+QR_PARALLEL_THRESHOLD = 32
+
+# SHORT LINK SETTINGS
+# QR codes encode <base_url><product_prefix>/<id> instead of the full page
+# URL; docs/p/<id>.html and docs/o/<id>.html redirect to the product page
+# and to a WhatsApp order. GitHub Pages serves them without the .html.
+# Point base_url at a shorter custom domain to shrink the codes further.
+SHORT_LINK_SETTINGS = {
+    'enabled': True,
+    'base_url': SITE_URL,
+    'product_prefix': 'p',
+    'order_prefix': 'o',
+    'order_qr': False
+}
+
+# PRINT SHEET SETTINGS
+# Label sheets for printing: QR code, product name and price in a grid of
+# columns x rows per page. Sizes are in millimetres (A4 by default).
+PRINT_SHEET_SETTINGS = {
+    'folder': 'print',
+    'formats': ('pdf', 'svg'),
+    'page_width': 210,
+    'page_height': 297,
+    'margin': 10,
+    'columns': 4,
+    'rows': 6,
+    'padding': 2,
+    'font_size': 3
+}
+
+# PRODUCT IMAGE SETTINGS
+# Remote product photos are downloaded once into cache_folder and served
+# from docs/<output_folder> as resized WebP + JPEG variants.
+IMAGE_SETTINGS = {
+    'cache_folder': os.path.join('.cache', 'images'),
+    'output_folder': 'images',
+    'variants': {
+        'thumb': {'widths': [120, 240], 'square': True, 'sizes': '120px'},
+        'detail': {'widths': [480, 960], 'square': False, 'sizes': '(max-width: 520px) 100vw, 480px'}
+    },
+    'webp_quality': 80,
+    'jpeg_quality': 82,
+    'revalidate_after': 24 * 60 * 60,
+    'fetch_workers': 16,
+    'timeout': 15
+}
+
+# LINK CHECK SETTINGS
+# --check-links probes every external URL the site points at (product
+# photos, the wa.me links, the Instagram profile). Results are kept in
+# cache_file for ttl seconds, failures for failure_ttl, so repeat builds
+# only probe new or expired links. The query of wa.me links is just the
+# prefilled message, so all order links are checked as one.
+LINK_CHECK_SETTINGS = {
+    'cache_file': os.path.join('.cache', 'links.json'),
+    'ttl': 24 * 60 * 60,
+    'failure_ttl': 15 * 60,
+    'connections': 128,
+    'connections_per_host': 16,
+    'timeout': 10,
+    'max_redirects': 5,
+    'strip_query_hosts': ['wa.me']
+}
+
+def create_final_website(incremental=False, index_settings=None, images=True, asset_settings=None, report=None,
+                         products=None, print_sheets=False, catalog_file=CATALOG_FILE, docs_folder='docs',
+                         workers=None, check_links=False):
+    """Create the final website with ALL features
+
+    With incremental=True only the outputs whose inputs (product rows,
+    BUSINESS_INFO or page templates) changed since the last build are
+    re-rendered, using the manifest stored in the docs folder.
+    index_settings overrides INDEX_SETTINGS for this build. images=False
+    skips the image stage and keeps hotlinking the remote product photos.
+    asset_settings overrides ASSET_SETTINGS. report is the BuildReport
+    that collects timings; its summary is written to build-report.json.
+    products is an already parsed catalog; catalog_file is read when None.
+    print_sheets also lays out every QR code on printable label sheets.
+    The report and print sheets go next to docs_folder. workers caps the
+    process pools of the QR and image stages. check_links reports the
+    external links and photos that are broken.
+    """
+    index_settings = {**INDEX_SETTINGS, **(index_settings or {})}
+    asset_settings = {**ASSET_SETTINGS, **(asset_settings or {})}
+    report = start_build_report(report)
+    log = report.log
+
+    log("🎯 CREATING COMPLETE WEBSITE WITH ALL FEATURES")
+    log("=" * 60)
+
     try:
         # Read your products.csv
-        df = pd.read_csv('products.csv')
-        print(f"✅ Loaded {len(df)} products from products.csv")
-        
+        with report.stage('load'):
+            if products is None:
+                products = load_catalog(catalog_file)
+        log(f"✅ Loaded {len(products)} products from {catalog_file}")
+
     except Exception as e:
-        print(f"❌ Error reading products.csv: {e}")
+        log(f"❌ Error reading {catalog_file}: {e}")
+        report.finish()
         return
-    
+
     # Create docs folder
-    docs_folder = 'docs'
     os.makedirs(docs_folder, exist_ok=True)
-    
-    print(f"\n🚀 Generating website files in '{docs_folder}' folder...")
-    
+    output_root = os.path.dirname(docs_folder)
+    report.folder = docs_folder
+
+    log(f"\n🚀 Generating website files in '{docs_folder}' folder...")
+
+    with report.stage('manifest'):
+        build = BuildManifest(docs_folder, incremental, options={**asset_settings, 'qr_format': QR_SETTINGS['format'],
+                                                                'offline': OFFLINE_SETTINGS['enabled']})
+        business_hash = hash_business_info()
+        row_hashes = {product.product_id: hash_product_row(product) for product in products}
+        build.record_inputs(business_hash, row_hashes)
+
+    if check_links:
+        with report.stage('validate'):
+            check_external_links(products)
+    if images:
+        with report.stage('images'):
+            create_images(products, docs_folder, build, workers)
+    # Pages depend on the product row and on the local image variants it uses
+    page_hashes = {product.product_id: hash_text(row_hashes[product.product_id], image_signature(product))
+                   for product in products}
+
     # Create all website files
-    create_styles(docs_folder)
-    create_index_page(df, docs_folder)
-    create_contact_page(docs_folder)
-    create_about_page(df, docs_folder)
+    _asset_names['qr_extension'] = QR_SETTINGS['format']
+    _asset_names['service_worker'] = OFFLINE_SETTINGS['service_worker'] if OFFLINE_SETTINGS['enabled'] else ''
+    with report.stage('styles'):
+        css_content = get_stylesheet(asset_settings['minify'])
+        _asset_names['styles.css'] = stylesheet_name(css_content, asset_settings['fingerprint'])
+        if build.is_stale(_asset_names['styles.css'], css_content):
+            create_styles(docs_folder, asset_settings['minify'], asset_settings['fingerprint'])
+    # Every page links the stylesheet by name and may inline its rules
+    business_hash = hash_text(business_hash, json.dumps(_asset_names, sort_keys=True), css_content)
+    with report.stage('browse'):
+        views = catalog_views(products) if BROWSE_SETTINGS['enabled'] else {}
+        facets = render_facets(views)
+        create_browse_pages(views, docs_folder, build, facets, page_hashes, business_hash)
+    with report.stage('index'):
+        create_catalog_index(products, docs_folder, build, index_settings, page_hashes, business_hash, facets)
+    with report.stage('search'):
+        create_search_index(products, docs_folder, build)
+    with report.stage('pages'):
+        if build.is_stale('contact.html', hash_template(create_contact_page, *PAGE_FRAGMENTS, 'contact'), business_hash):
+            create_contact_page(docs_folder)
+        if build.is_stale('about.html', hash_template(create_about_page, *PAGE_FRAGMENTS, 'about'), business_hash):
+            create_about_page(products, docs_folder)
+
+    with report.stage('products'):
+        product_template_hash = hash_template(create_product_page, *PAGE_FRAGMENTS, 'product', 'other_product')
+        for position, product in enumerate(products):
+            others = get_other_products(product, products, position)
+            other_hashes = [page_hashes[other.product_id] for other in others]
+            if build.is_stale(f"product-{product.product_id}.html", product_template_hash, business_hash,
+                              page_hashes[product.product_id], *other_hashes):
+                create_product_page(product, docs_folder, products, others)
+
+    if SHORT_LINK_SETTINGS['enabled']:
+        with report.stage('links'):
+            create_short_links(products, docs_folder, build, row_hashes, hash_business_info())
+
+    with report.stage('qr'):
+        stale_qr = [product for product in products
+                    if any([build.is_stale(filename, qr_cache_key(url)) for filename, url, full_url in qr_codes_for(product)])]
+        if stale_qr:
+            create_qr_codes(stale_qr, docs_folder, workers=workers)
+    if print_sheets:
+        with report.stage('print'):
+            create_print_sheets(products, os.path.join(output_root, PRINT_SHEET_SETTINGS['folder']), workers=workers)
+
+    if asset_settings['critical_css']:
+        with report.stage('critical'):
+            inline_critical_css(docs_folder, build, css_content, asset_settings['full_stylesheet'])
+    with report.stage('optimize'):
+        optimize_outputs(docs_folder, build, asset_settings, workers)
+    if OFFLINE_SETTINGS['enabled']:
+        with report.stage('offline'):
+            create_service_worker(products, docs_folder, build)
+            # The revisions are hashes of the optimized files, so sw.js and its manifest come last
+            optimize_outputs(docs_folder, build, asset_settings, workers,
+                             [OFFLINE_SETTINGS['service_worker'], OFFLINE_SETTINGS['manifest']])
+    with report.stage('cleanup'):
+        removed = build.remove_unused_outputs()
+        build.save()
+    report.count('outputs_rebuilt', build.rebuilt)
+    report.count('outputs_unchanged', build.skipped)
+    report.count('outputs_removed', removed)
+    report.finish(products=len(products), incremental=build.incremental)
+
+    if incremental:
+        log(f"\n♻️ Incremental build: {build.rebuilt} rebuilt, {build.skipped} unchanged, {removed} removed")
+    report.print_summary()
+    log(f"\n🎉 COMPLETE WEBSITE WITH ALL FEATURES READY!")
+    log(f"📁 Check the '{docs_folder}' folder for your files")
+    log(f"🌐 Your live site: {SITE_URL}")
+    report.save(os.path.join(output_root, BUILD_REPORT_FILE))
+
+# BUILD INSTRUMENTATION
+class BuildReport:
+    """Timings, output sizes and cache counters of one build
+
+    stage() times a build stage, record_file() every file written to docs/
+    and count() cache hits and misses. Messages go through log() so they
+    end up in build-report.json too. profile and trace_memory turn on
+    cProfile and tracemalloc for the whole build. File paths are recorded
+    relative to folder, the docs folder of the build.
+    """
+
+    def __init__(self, profile=False, trace_memory=False, verbose=False):
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.verbose = verbose
+        self.folder = None
+        self.stages = []
+        self.files = []
+        self.file_records = {}
+        self.counters = {}
+        self.details = {}
+        self.messages = []
+        self.summary = {}
+        self.current_stage = None
+        self.profiler = None
+        self.started = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        if self.profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a build stage and attribute the files it writes to it"""
+        record = {'name': name, 'seconds': 0.0, 'files': 0, 'bytes': 0}
+        previous_stage, self.current_stage = self.current_stage, record
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = round(time.perf_counter() - started, 6)
+            if tracemalloc.is_tracing():
+                record['peak_traced_bytes'] = tracemalloc.get_traced_memory()[1]
+            self.stages.append(record)
+            self.current_stage = previous_stage
+
+    def record_file(self, path, render_seconds, write_seconds, size, product_id=None):
+        """Record a file written by the current stage
+
+        A file rewritten later in the build (minified, given critical CSS)
+        keeps one record with its final size; the rewrite still counts
+        towards the files and bytes of the stage doing it.
+        """
+        path = self.relative_path(path)
+        stage = self.current_stage
+        if stage is not None:
+            stage['files'] += 1
+            stage['bytes'] += size
+        record = self.file_records.get(path)
+        if record is not None:
+            record['render_seconds'] = round(record['render_seconds'] + render_seconds, 6)
+            record['write_seconds'] = round(record['write_seconds'] + write_seconds, 6)
+            record['bytes'] = size
+            return
+        record = self.file_records[path] = {
+            'path': path,
+            'stage': stage['name'] if stage else None,
+            'render_seconds': round(render_seconds, 6),
+            'write_seconds': round(write_seconds, 6),
+            'bytes': size,
+            'product_id': product_id
+        }
+        self.files.append(record)
+        self.log(f"📄 Created: {path}", verbose=True)
+
+    def relative_path(self, path):
+        if self.folder is None:
+            return path
+        prefix = os.path.join(self.folder, '')
+        return path[len(prefix):] if path.startswith(prefix) else os.path.relpath(path, self.folder)
+
+    def record(self, section, **fields):
+        """Add a row to a named table of the report, e.g. one per QR code"""
+        self.details.setdefault(section, []).append(fields)
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def log(self, message, verbose=False):
+        """Print a progress message and keep it for the report"""
+        self.messages.append(message.strip())
+        if self.verbose or not verbose:
+            print(message)
+
+    def slowest_products(self, limit=10):
+        """Product pages that took longest to render and write"""
+        pages = [record for record in self.files if record['product_id'] is not None and record['stage'] == 'products']
+        pages.sort(key=lambda record: record['render_seconds'] + record['write_seconds'], reverse=True)
+        return pages[:limit]
+
+    def finish(self, **summary):
+        """Stop the profilers and freeze the totals"""
+        self.summary = {
+            'seconds': round(time.perf_counter() - (self.started or time.perf_counter()), 6),
+            'files_written': len(self.files),
+            'bytes_written': sum(record['bytes'] for record in self.files),
+            **summary
+        }
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(BUILD_PROFILE_FILE)
+            stats = pstats.Stats(self.profiler).sort_stats('cumulative')
+            self.summary['profile'] = [
+                {'function': f"{filename}:{line}({name})", 'calls': calls, 'cumulative_seconds': round(cumulative, 6)}
+                for (filename, line, name), (primitive, calls, total, cumulative, callers)
+                in sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:25]
+            ]
+            self.profiler = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            self.summary['peak_traced_bytes'] = tracemalloc.get_traced_memory()[1]
+            self.summary['top_allocations'] = [
+                {'location': str(statistic.traceback), 'bytes': statistic.size, 'blocks': statistic.count}
+                for statistic in snapshot.statistics('lineno')[:10]
+            ]
+            tracemalloc.stop()
+
+    def to_dict(self):
+        return {
+            **self.summary,
+            'stages': self.stages,
+            'counters': self.counters,
+            'slowest_products': self.slowest_products(),
+            **self.details,
+            'files': self.files,
+            'messages': self.messages
+        }
+
+    def print_summary(self):
+        print("\n⏱️ Build stages:")
+        for stage in self.stages:
+            print(f"   {stage['name']:<10} {stage['seconds']:>9.3f}s {stage['files']:>7} files {stage['bytes'] / 1e6:>9.2f} MB")
+        slowest = self.slowest_products(3)
+        if slowest:
+            print("🐢 Slowest products: " + ', '.join(
+                f"{record['product_id']} ({(record['render_seconds'] + record['write_seconds']) * 1000:.1f} ms)"
+                for record in slowest))
+
+    def save(self, path=BUILD_REPORT_FILE):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"📊 Build report: {path}")
+
+_build_report = BuildReport()
+
+def start_build_report(report=None):
+    """Make report (or a fresh BuildReport) the one generators record into"""
+    global _build_report
+    _build_report = report or BuildReport()
+    _build_report.start()
+    return _build_report
+
+def write_output(folder, filename, chunks, product_id=None):
+    """Write rendered text to folder/filename and record it in the build report
+
+    chunks is a string or an iterable of strings; time spent producing the
+    chunks counts as render time, time spent in write() as write time.
+    """
+    path = os.path.join(folder, filename)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if isinstance(chunks, str):
+        chunks = [chunks]
+    render_seconds = write_seconds = 0.0
+    with open(path, 'w', encoding='utf-8') as f:
+        started = time.perf_counter()
+        for chunk in chunks:
+            rendered = time.perf_counter()
+            render_seconds += rendered - started
+            f.write(chunk)
+            started = time.perf_counter()
+            write_seconds += started - rendered
+    _build_report.record_file(path, render_seconds, write_seconds, os.path.getsize(path), product_id)
+
+# CATALOG INGESTION
+class Product:
+    """One products.csv row
+
+    Fields are slots named after PRODUCT_COLUMNS and are also readable as
+    product['price'], so page generators accept these records and pandas
+    rows alike. price_kobo is the price parsed to an integer number of
+    kobo (None when the price has no number in it).
+    """
+    __slots__ = PRODUCT_COLUMNS + ('price_kobo', 'row_hash')
+
+    def __init__(self, product_id, product_name, price, description, manufacturer, image_url, instagram_handle,
+                 price_kobo=None, row_hash=None):
+        self.product_id = product_id
+        self.product_name = product_name
+        self.price = price
+        self.description = description
+        self.manufacturer = manufacturer
+        self.image_url = image_url
+        self.instagram_handle = instagram_handle
+        self.price_kobo = parse_price(price) if price_kobo is None else price_kobo
+        self.row_hash = row_hash
+
+    def __getitem__(self, column):
+        return getattr(self, column)
     
-    for index, row in df.iterrows():
-        create_product_page(row, docs_folder, df)
+    def __iter__(self):
+        return (getattr(self, column) for column in PRODUCT_COLUMNS)
     
-    create_qr_codes(df, docs_folder)
+    def __eq__(self, other):
+        return isinstance(other, Product) and tuple(self) == tuple(other)
     
-    print(f"\n🎉 COMPLETE WEBSITE WITH ALL FEATURES READY!")
-    print(f"📁 Check the '{docs_folder}' folder for your files")
-    print(f"🌐 Your live site: https://saphcakes.github.io/product-qr-system/")
-
-def create_index_page(df, folder):
-    """Create main page with custom cakes section and reordered sections"""
-    products_html = ''
-    for index, row in df.iterrows():
-        whatsapp_message = f"Hello! I'm interested in: {row['product_name']} - {row['price']}"
-        encoded_message = whatsapp_message.replace(' ', '%20')
-        whatsapp_url = f"https://wa.me/{BUSINESS_INFO['whatsapp_number']}?text={encoded_message}"
+    def __repr__(self):
+        return f"Product({self.product_id!r}, {self.product_name!r})"
+
+def read_products(path='products.csv'):
+    """Stream products.csv as Product records, one row at a time"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = [column.strip() for column in next(reader, [])]
+        missing = [column for column in PRODUCT_COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"{path} is missing columns: {', '.join(missing)}")
+        positions = [header.index(column) for column in PRODUCT_COLUMNS]
         
-        products_html += f'''
-        <div class="product-item">
-            <img src="{row['image_url']}" alt="{row['product_name']}" class="product-thumbnail">
-            <div class="product-info">
-                <h3>{row['product_name']}</h3>
-                <div class="price">{row['price']}</div>
-                <p class="preview-desc">{row['description'][:80]}...</p>
-                <div class="actions">
-                    <a href="product-{row['product_id']}.html" class="view-btn">View Details</a>
-                    <a href="{whatsapp_url}" class="whatsapp-btn-small" target="_blank">Order Now</a>
-                    <a href="qr-{row['product_id']}.png" download class="qr-btn">Download QR</a>
-                </div>
-            </div>
-        </div>
-        '''
+        for line in reader:
+            if not line:
+                continue
+            line += [''] * (len(header) - len(line))
+            yield Product(*[line[position].strip() for position in positions])
+
+PRICE_NUMBER = re.compile(r'\d[\d,]*(?:\.\d+)?')
+
+def parse_price(text):
+    """Price text such as '₦35000' or '₦2,500.50' as kobo, or None"""
+    match = PRICE_NUMBER.search(str(text))
+    if not match:
+        return None
+    naira, _, kobo = match.group(0).replace(',', '').partition('.')
+    return int(naira) * 100 + int((kobo + '00')[:2])
+
+def load_products_dataframe(path='products.csv'):
+    """Load the catalog as a pandas DataFrame, for callers that want one"""
+    import pandas as pd
+    return pd.read_csv(path)
+
+def iter_products(products):
+    """Iterate Product records or the rows of a pandas DataFrame"""
+    if hasattr(products, 'iterrows'):
+        return (row for index, row in products.iterrows())
+    return iter(products)
+
+# CATALOG SNAPSHOT
+# A parsed catalog is kept in .cache/catalog/ as typed binary columns so
+# later runs skip the CSV parse while the CSV bytes are unchanged:
+#   int   one array('q') buffer (product_id and price_kobo when every value fits
+#         in 64 bits; otherwise they are stored as text)
+#   text  character offsets + one UTF-8 blob (names, descriptions, image URLs)
+#   dict  array('I') codes into an interned text column of distinct values
+#   hash  the 8-byte row hashes back to back
+# The file is a magic line, a JSON header with the column layout, then the
+# buffers. It is a local cache in native byte order, not an exchange format.
+SNAPSHOT_MAGIC = b'PQRCATALOG\n'
+INT64_RANGE = range(-2 ** 63, 2 ** 63)
+
+def load_catalog(path=CATALOG_FILE, snapshot_folder=CATALOG_SNAPSHOT_FOLDER):
+    """Products of a catalog CSV, read from its snapshot while the CSV is unchanged"""
+    csv_hash = hash_file(path)
+    snapshot = os.path.join(snapshot_folder, hash_text(os.path.abspath(path)) + '.snapshot')
+    products = read_catalog_snapshot(snapshot, csv_hash)
+    if products is not None:
+        _build_report.count('catalog_snapshot_hits')
+        return products
+
+    # read_products() streams, but the build keeps the whole catalog: the
+    # index, search index and browse pages list every product, and each
+    # product page links to its neighbours. The slotted records keep that
+    # list compact, which is the memory the index page needs anyway.
+    products = list(read_products(path))
+    for product in products:
+        hash_product_row(product)
+    # The snapshot is only a cache: failing to write it never fails the build
+    try:
+        os.makedirs(snapshot_folder, exist_ok=True)
+        write_catalog_snapshot(snapshot, csv_hash, products)
+    except (OSError, ValueError, OverflowError) as e:
+        _build_report.log(f"⚠️ Could not write the catalog snapshot: {e}")
+    _build_report.count('catalog_snapshot_misses')
+    return products
+
+def write_catalog_snapshot(path, csv_hash, products):
+    ids = [product.product_id for product in products]
+    id_kind = 'int' if all(value.isdigit() and str(int(value)) == value and int(value) in INT64_RANGE
+                           for value in ids) else 'text'
+    prices = [-1 if product.price_kobo is None else product.price_kobo for product in products]
+    price_kind = 'int' if all(price_kobo in INT64_RANGE for price_kobo in prices) else 'text'
+    if price_kind == 'text':
+        prices = [str(price_kobo) for price_kobo in prices]
+    columns = [
+        ('product_id', id_kind, ids),
+        ('product_name', 'text', [product.product_name for product in products]),
+        ('price', 'dict', [product.price for product in products]),
+        ('price_kobo', price_kind, prices),
+        ('description', 'text', [product.description for product in products]),
+        ('manufacturer', 'dict', [product.manufacturer for product in products]),
+        ('image_url', 'text', [product.image_url for product in products]),
+        ('instagram_handle', 'dict', [product.instagram_handle for product in products]),
+        ('row_hash', 'hash', [hash_product_row(product) for product in products])
+    ]
+    header = {
+        'version': CATALOG_SNAPSHOT_VERSION,
+        'byteorder': sys.byteorder,
+        'csv_hash': csv_hash,
+        'rows': len(products),
+        'columns': []
+    }
+    buffers = []
+    for name, kind, values in columns:
+        encoded = SNAPSHOT_ENCODERS[kind](values)
+        header['columns'].append({'name': name, 'kind': kind, 'sizes': [len(buffer) for buffer in encoded]})
+        buffers.extend(encoded)
+    write_atomic(path, SNAPSHOT_MAGIC + json.dumps(header).encode('utf-8') + b'\n' + b''.join(buffers))
+
+def read_catalog_snapshot(path, csv_hash):
+    """Products stored in a snapshot, or None when it is missing or stale"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if csv_hash is None or not data.startswith(SNAPSHOT_MAGIC):
+        return None
+    try:
+        end = data.index(b'\n', len(SNAPSHOT_MAGIC))
+        header = json.loads(data[len(SNAPSHOT_MAGIC):end])
+        if (header['version'], header['byteorder'], header['csv_hash']) != (
+                CATALOG_SNAPSHOT_VERSION, sys.byteorder, csv_hash):
+            return None
+        view = memoryview(data)
+        position = end + 1
+        columns = {}
+        for column in header['columns']:
+            buffers = []
+            for size in column['sizes']:
+                buffers.append(view[position:position + size])
+                position += size
+            columns[column['name']] = SNAPSHOT_DECODERS[column['kind']](buffers)
+    except (ValueError, KeyError, UnicodeDecodeError):
+        return None
+
+    kinds = {column['name']: column['kind'] for column in header['columns']}
+    if kinds['product_id'] == 'int':
+        columns['product_id'] = [str(value) for value in columns['product_id']]
+    if kinds['price_kobo'] == 'text':
+        columns['price_kobo'] = [int(value) for value in columns['price_kobo']]
+    columns['price_kobo'] = [None if price_kobo < 0 else price_kobo for price_kobo in columns['price_kobo']]
+    return list(itertools.starmap(Product, zip(*[columns[column] for column in Product.__slots__])))
+
+def encode_text(values):
+    offsets = array('q', itertools.accumulate(map(len, values), initial=0))
+    return [offsets.tobytes(), ''.join(values).encode('utf-8')]
+
+def decode_text(buffers):
+    offsets = array('q')
+    offsets.frombytes(buffers[0])
+    text = str(buffers[1], 'utf-8')
+    return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+def encode_dict(values):
+    distinct = list(dict.fromkeys(values))
+    codes = {value: code for code, value in enumerate(distinct)}
+    return [array('I', [codes[value] for value in values]).tobytes()] + encode_text(distinct)
+
+def decode_dict(buffers):
+    codes = array('I')
+    codes.frombytes(buffers[0])
+    distinct = [sys.intern(value) for value in decode_text(buffers[1:])]
+    return [distinct[code] for code in codes]
+
+def encode_int(values):
+    return [array('q', [int(value) for value in values]).tobytes()]
+
+def decode_int(buffers):
+    values = array('q')
+    values.frombytes(buffers[0])
+    return values.tolist()
+
+def encode_hash(values):
+    return [bytes.fromhex(''.join(values))]
+
+def decode_hash(buffers):
+    text = buffers[0].hex()
+    return [text[start:start + 16] for start in range(0, len(text), 16)]
+
+SNAPSHOT_ENCODERS = {'int': encode_int, 'text': encode_text, 'dict': encode_dict, 'hash': encode_hash}
+SNAPSHOT_DECODERS = {'int': decode_int, 'text': decode_text, 'dict': decode_dict, 'hash': decode_hash}
+
+# INCREMENTAL BUILDS
+def hash_text(*parts):
+    """Stable short hash of the given values"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+def hash_file(path):
+    """sha256 of a file's bytes, or None when it cannot be read"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def hash_business_info():
+    """Hash of BUSINESS_INFO, used as an input of every page"""
+    return hash_text(json.dumps(BUSINESS_INFO, sort_keys=True))
+
+def hash_product_row(row):
+    """Hash of one products.csv row, kept on Product records once computed"""
+    row_hash = getattr(row, 'row_hash', None)
+    if row_hash is None:
+        row_hash = hash_text(*[row[column] for column in PRODUCT_COLUMNS])
+        if isinstance(row, Product):
+            row.row_hash = row_hash
+    return row_hash
+
+_template_hashes = {}
+
+def hash_template(generator, *template_names):
+    """Hash of a page generator and the templates it renders
+
+    Cached per process: the source cannot change without a restart.
+    """
+    key = (generator.__name__,) + template_names
+    if key not in _template_hashes:
+        _template_hashes[key] = hash_text(inspect.getsource(generator), *[TEMPLATES[name] for name in template_names])
+    return _template_hashes[key]
+
+class BuildManifest:
+    """Input hashes of every file written to the docs folder
+
+    Each output is keyed by a hash of everything it is rendered from, so a
+    rebuild only needs to re-render outputs whose key changed. Changing the
+    build options (minification, compression...) invalidates every output.
+    """
+
+    def __init__(self, folder, incremental=True, options=None):
+        self.folder = folder
+        self.options = hash_text(json.dumps(options or {}, sort_keys=True))
+        self.previous = self.load()
+        self.incremental = incremental and self.previous.get('options') == self.options
+        self.inputs = {}
+        self.outputs = {}
+        self.written = set()
+        self.rebuilt = 0
+        self.skipped = 0
+
+    @property
+    def path(self):
+        return os.path.join(self.folder, MANIFEST_FILENAME)
     
-    html_content = f'''
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest
+    
+    def record_inputs(self, business_hash, row_hashes):
+        """Keep the raw input hashes in the manifest for inspection"""
+        self.inputs = {'business_info': business_hash, 'products': row_hashes}
+    
+    def is_stale(self, filename, *inputs):
+        """Register an output and tell whether it has to be rendered again"""
+        key = hash_text(*inputs)
+        self.outputs[filename] = key
+        previous_key = self.previous.get('outputs', {}).get(filename)
+        if self.incremental and previous_key == key and os.path.exists(os.path.join(self.folder, filename)):
+            self.skipped += 1
+            return False
+        self.written.add(filename)
+        self.rebuilt += 1
+        return True
+    
+    def remove_unused_outputs(self):
+        """Delete outputs of the previous build that are no longer produced"""
+        removed = 0
+        for filename in {**dict.fromkeys(LEGACY_OUTPUTS), **self.previous.get('outputs', {})}:
+            path = os.path.join(self.folder, filename)
+            if filename not in self.outputs and os.path.exists(path):
+                os.remove(path)
+                _build_report.log(f"🗑️ Removed: {filename}", verbose=True)
+                removed += 1
+        return removed
+    
+    def save(self):
+        manifest = {'version': MANIFEST_VERSION, 'options': self.options,
+                    'inputs': self.inputs, 'outputs': self.outputs}
+        started = time.perf_counter()
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, separators=(',', ':'), sort_keys=True)
+        _build_report.record_file(self.path, 0.0, time.perf_counter() - started, os.path.getsize(self.path))
+
+# PAGE TEMPLATES
+# Placeholders are written {{field}} so inline CSS/JS braces need no escaping.
+HEAD_TEMPLATE = '''    <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{BUSINESS_INFO['business_name']}</title>
-        <link rel="stylesheet" href="styles.css">
-    </head>
-    <body>
-        <nav class="main-nav">
+        <title>{{title}}</title>
+        <link rel="stylesheet" href="{{stylesheet}}">{{service_worker}}
+    </head>'''
+
+NAV_TEMPLATE = '''        <nav class="main-nav">
             <div class="nav-container">
-                <a href="index.html" class="nav-logo">🍰 {BUSINESS_INFO['business_name']}</a>
+                <a href="index.html" class="nav-logo">🍰 {{business_name}}</a>
                 <div class="nav-links">
-                    <a href="index.html" class="active">Home</a>
-                    <a href="about.html">About</a>
-                    <a href="contact.html">Contact</a>
+                    <a href="index.html"{{home_class}}>Home</a>
+                    <a href="about.html"{{about_class}}>About</a>
+                    <a href="contact.html"{{contact_class}}>Contact</a>
                 </div>
             </div>
-        </nav>
+        </nav>'''
+
+INDEX_TEMPLATE = '''
+    <!DOCTYPE html>
+    <html lang="en">
+{{head}}
+    <body>
+{{nav}}
 
         <div class="container">
             <header class="hero-section">
-                <h1>{BUSINESS_INFO['business_name']}</h1>
+                <h1>{{business_name}}</h1>
                 <p class="tagline">Authentic Nigerian Treats & Custom Cakes Made with Love ❤️</p>
-                <p class="hero-address">📍 {BUSINESS_INFO['address']}</p>
+                <p class="hero-address">📍 {{address}}</p>
                 
                 <div class="instagram-cta">
-                    <a href="https://instagram.com/{BUSINESS_INFO['instagram_handle']}" class="instagram-link" target="_blank">
-                        📷 Follow @{BUSINESS_INFO['instagram_handle']} for more creations
+                    <a href="https://instagram.com/{{instagram_handle}}" class="instagram-link" target="_blank">
+                        📷 Follow @{{instagram_handle}} for more creations
                     </a>
                 </div>
                 
                 <div class="hero-actions">
                     <a href="#products" class="cta-btn">View Products</a>
                     <a href="#custom-cakes" class="cta-btn">Custom Cakes</a>
-                    <a href="https://wa.me/{BUSINESS_INFO['whatsapp_number']}" class="cta-btn-whatsapp" target="_blank">📱 Get Quote</a>
+                    <a href="https://wa.me/{{whatsapp_number}}" class="cta-btn-whatsapp" target="_blank">📱 Get Quote</a>
                 </div>
             </header>
 
@@ -167,7 +964,7 @@ def create_index_page(df, folder):
                     </div>
                     
                     <div class="cta-cakes">
-                        <a href="https://wa.me/{BUSINESS_INFO['whatsapp_number']}?text=Hello! I'd like to get a quote for a custom cake" class="cta-btn-whatsapp large" target="_blank">
+                        <a href="https://wa.me/{{whatsapp_number}}?text=Hello! I'd like to get a quote for a custom cake" class="cta-btn-whatsapp large" target="_blank">
                             📱 Get Custom Cake Quote
                         </a>
                         <p class="cta-note">Send us a message with your event details for a personalized quote</p>
@@ -179,10 +976,11 @@ def create_index_page(df, folder):
             <section id="products" class="products-section">
                 <h2>Our Delicious Ready-to-Order Products</h2>
                 <p class="section-subtitle">Click any product to view details and order</p>
-                
+{{search_box}}{{facets}}
+
                 <div class="products-grid">
-                    {products_html}
-                </div>
+                    {{products}}
+                </div>{{pagination}}
             </section>
 
             <!-- QR Codes Section (Moved Below Products) -->
@@ -191,19 +989,19 @@ def create_index_page(df, folder):
                 <p>Download QR codes to share products with customers - perfect for packaging, menus, and social media</p>
                 <div class="qr-codes-grid">
                     <div class="qr-code-item">
-                        <img src="qr-101.png" alt="QR Code for Kilishi" class="qr-code-image">
+                        <img src="qr-101.{{qr_extension}}" alt="QR Code for Kilishi" class="qr-code-image">
                         <p>Kilishi QR Code</p>
-                        <a href="qr-101.png" download class="download-btn">Download</a>
+                        <a href="qr-101.{{qr_extension}}" download class="download-btn">Download</a>
                     </div>
                     <div class="qr-code-item">
-                        <img src="qr-102.png" alt="QR Code for Chin Chin" class="qr-code-image">
+                        <img src="qr-102.{{qr_extension}}" alt="QR Code for Chin Chin" class="qr-code-image">
                         <p>Chin Chin QR Code</p>
-                        <a href="qr-102.png" download class="download-btn">Download</a>
+                        <a href="qr-102.{{qr_extension}}" download class="download-btn">Download</a>
                     </div>
                     <div class="qr-code-item">
-                        <img src="qr-103.png" alt="QR Code for Small Chops" class="qr-code-image">
+                        <img src="qr-103.{{qr_extension}}" alt="QR Code for Small Chops" class="qr-code-image">
                         <p>Small Chops QR Code</p>
-                        <a href="qr-103.png" download class="download-btn">Download</a>
+                        <a href="qr-103.{{qr_extension}}" download class="download-btn">Download</a>
                     </div>
                     <div class="qr-code-item">
                         <p>+4 More QR Codes</p>
@@ -227,9 +1025,9 @@ def create_index_page(df, folder):
         <footer class="main-footer">
             <div class="footer-content">
                 <div class="footer-section">
-                    <h3>{BUSINESS_INFO['business_name']}</h3>
+                    <h3>{{business_name}}</h3>
                     <p>Custom Cakes & Authentic Nigerian Treats</p>
-                    <p>📍 {BUSINESS_INFO['address']}</p>
+                    <p>📍 {{address}}</p>
                 </div>
                 <div class="footer-section">
                     <h3>Quick Links</h3>
@@ -240,51 +1038,47 @@ def create_index_page(df, folder):
                 </div>
                 <div class="footer-section">
                     <h3>Connect With Us</h3>
-                    <a href="https://instagram.com/{BUSINESS_INFO['instagram_handle']}" target="_blank">📷 Instagram</a>
-                    <a href="https://wa.me/{BUSINESS_INFO['whatsapp_number']}" target="_blank">📱 WhatsApp</a>
-                    <a href="tel:{BUSINESS_INFO['phone_number']}">📞 Call Us</a>
+                    <a href="https://instagram.com/{{instagram_handle}}" target="_blank">📷 Instagram</a>
+                    <a href="https://wa.me/{{whatsapp_number}}" target="_blank">📱 WhatsApp</a>
+                    <a href="tel:{{phone_number}}">📞 Call Us</a>
                 </div>
             </div>
             <div class="footer-bottom">
-                <p>&copy; 2024 {BUSINESS_INFO['business_name']}. All rights reserved.</p>
+                <p>&copy; 2024 {{business_name}}. All rights reserved.</p>
             </div>
         </footer>
     </body>
     </html>
     '''
-    
-    with open(os.path.join(folder, 'index.html'), 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    print("📄 Created: index.html with custom cakes and reordered sections")
 
-def create_contact_page(folder):
-    """Create contact page with FIXED Instagram link"""
-    html_content = f'''
+PRODUCT_CARD_TEMPLATE = '''
+        <div class="product-item">
+            {{thumbnail}}
+            <div class="product-info">
+                <h3>{{product_name}}</h3>
+                <div class="price">{{price}}</div>
+                <p class="preview-desc">{{short_description}}...</p>
+                <div class="actions">
+                    <a href="product-{{product_id}}.html" class="view-btn">View Details</a>
+                    <a href="{{whatsapp_url}}" class="whatsapp-btn-small" target="_blank">Order Now</a>
+                    <a href="qr-{{product_id}}.{{qr_extension}}" download class="qr-btn">Download QR</a>
+                </div>
+            </div>
+        </div>
+        '''
+
+CONTACT_TEMPLATE = '''
     <!DOCTYPE html>
     <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Contact Us | {BUSINESS_INFO['business_name']}</title>
-        <link rel="stylesheet" href="styles.css">
-    </head>
+{{head}}
     <body>
-        <nav class="main-nav">
-            <div class="nav-container">
-                <a href="index.html" class="nav-logo">🍰 {BUSINESS_INFO['business_name']}</a>
-                <div class="nav-links">
-                    <a href="index.html">Home</a>
-                    <a href="about.html">About</a>
-                    <a href="contact.html" class="active">Contact</a>
-                </div>
-            </div>
-        </nav>
+{{nav}}
 
         <div class="container">
             <div class="page-header">
                 <h1>Contact Us</h1>
                 <p>Get in touch to place orders or get quotes for custom cakes</p>
-                <p class="business-address">📍 {BUSINESS_INFO['address']}</p>
+                <p class="business-address">📍 {{address}}</p>
             </div>
 
             <div class="contact-grid">
@@ -292,24 +1086,24 @@ def create_contact_page(folder):
                     <div class="contact-icon">📱</div>
                     <h3>WhatsApp</h3>
                     <p>Fastest way to order or get quotes</p>
-                    <p class="contact-number">{BUSINESS_INFO['whatsapp_number']}</p>
-                    <a href="https://wa.me/{BUSINESS_INFO['whatsapp_number']}" class="contact-btn whatsapp" target="_blank">Message on WhatsApp</a>
+                    <p class="contact-number">{{whatsapp_number}}</p>
+                    <a href="https://wa.me/{{whatsapp_number}}" class="contact-btn whatsapp" target="_blank">Message on WhatsApp</a>
                 </div>
 
                 <div class="contact-method">
                     <div class="contact-icon">📞</div>
                     <h3>Phone Call</h3>
                     <p>Speak directly with us</p>
-                    <p class="contact-number">{BUSINESS_INFO['phone_number']}</p>
-                    <a href="tel:{BUSINESS_INFO['phone_number']}" class="contact-btn call">Call Now</a>
+                    <p class="contact-number">{{phone_number}}</p>
+                    <a href="tel:{{phone_number}}" class="contact-btn call">Call Now</a>
                 </div>
 
                 <div class="contact-method">
                     <div class="contact-icon">📷</div>
                     <h3>Instagram</h3>
                     <p>See our latest creations and updates</p>
-                    <p class="contact-number">@{BUSINESS_INFO['instagram_handle']}</p>
-                    <a href="https://instagram.com/{BUSINESS_INFO['instagram_handle']}" class="contact-btn instagram" target="_blank">Follow on Instagram</a>
+                    <p class="contact-number">@{{instagram_handle}}</p>
+                    <a href="https://instagram.com/{{instagram_handle}}" class="contact-btn instagram" target="_blank">Follow on Instagram</a>
                 </div>
             </div>
 
@@ -330,7 +1124,7 @@ def create_contact_page(folder):
                 </div>
                 <div class="note">
                     <h3>🚚 Delivery Information</h3>
-                    <p>{BUSINESS_INFO['delivery_info']}</p>
+                    <p>{{delivery_info}}</p>
                 </div>
             </div>
         </div>
@@ -338,32 +1132,868 @@ def create_contact_page(folder):
         <footer class="main-footer">
             <div class="footer-content">
                 <div class="footer-section">
-                    <h3>{BUSINESS_INFO['business_name']}</h3>
+                    <h3>{{business_name}}</h3>
                     <p>Custom Cakes & Nigerian Treats</p>
-                    <p>📍 {BUSINESS_INFO['address']}</p>
+                    <p>📍 {{address}}</p>
                 </div>
                 <div class="footer-section">
                     <h3>Contact</h3>
-                    <a href="https://wa.me/{BUSINESS_INFO['whatsapp_number']}" target="_blank">WhatsApp</a>
-                    <a href="tel:{BUSINESS_INFO['phone_number']}">Call Us</a>
-                    <a href="https://instagram.com/{BUSINESS_INFO['instagram_handle']}" target="_blank">Instagram</a>
+                    <a href="https://wa.me/{{whatsapp_number}}" target="_blank">WhatsApp</a>
+                    <a href="tel:{{phone_number}}">Call Us</a>
+                    <a href="https://instagram.com/{{instagram_handle}}" target="_blank">Instagram</a>
+                </div>
+            </div>
+        </footer>
+    </body>
+    </html>
+    '''
+
+ABOUT_TEMPLATE = '''
+    <!DOCTYPE html>
+    <html lang="en">
+{{head}}
+    <body>
+{{nav}}
+
+        <div class="container">
+            <div class="page-header">
+                <h1>About Us</h1>
+                <p>Authentic Nigerian treats made with love</p>
+            </div>
+
+            <div class="about-content">
+                <h2>Our Story</h2>
+                <p>Welcome to {{business_name}}! We specialize in authentic Nigerian treats that remind you of home.</p>
+                
+                <h2>Business Information</h2>
+                <div class="business-details">
+                    <p><strong>📍 Address:</strong> {{address}}</p>
+                    <p><strong>🕒 Hours:</strong> {{weekday_hours}}</p>
+                    <p><strong>🕒 Sunday:</strong> {{sunday_hours}}</p>
+                    <p><strong>🚚 Delivery:</strong> {{delivery_info}}</p>
+                    <p><strong>💳 Payment:</strong> {{payment_methods}}</p>
+                </div>
+            </div>
+        </div>
+
+        <footer class="main-footer">
+            <div class="footer-content">
+                <div class="footer-section">
+                    <h3>{{business_name}}</h3>
+                    <p>📍 {{address}}</p>
                 </div>
             </div>
         </footer>
     </body>
     </html>
     '''
+
+PRODUCT_TEMPLATE = '''
+    <!DOCTYPE html>
+    <html lang="en">
+{{head}}
+    <body>
+{{nav}}
+
+        <div class="container">
+            <div class="product-card">
+                <div class="product-header">
+                    <h1>{{product_name}}</h1>
+                    <div class="price">{{price}}</div>
+                    <div class="qr-download">
+                        <a href="qr-{{product_id}}.{{qr_extension}}" download class="qr-download-btn">
+                            📱 Download QR Code
+                        </a>
+                    </div>
+                </div>
+                
+                {{product_image}}
+                
+                <div class="product-details">
+                    <p class="description">{{description}}</p>
+                    
+                    <div class="action-buttons">
+                        <a href="{{whatsapp_url}}" class="whatsapp-btn" target="_blank">📱 Order via WhatsApp</a>
+                        <a href="tel:{{phone_number}}" class="call-btn">📞 Call to Order</a>
+                    </div>
+                    
+                    <div class="instagram-promo">
+                        <a href="https://instagram.com/{{instagram_handle}}" class="instagram-promo-btn" target="_blank">
+                            📷 Follow @{{instagram_handle}} for more products
+                        </a>
+                    </div>
+                    
+                    <div class="business-info">
+                        <h3>Order Information</h3>
+                        <div class="info-grid">
+                            <div class="info-item"><strong>Delivery:</strong> {{delivery_info}}</div>
+                            <div class="info-item"><strong>Payment:</strong> {{payment_methods}}</div>
+                            <div class="info-item"><strong>Hours:</strong> {{weekday_hours}}</div>
+                            <div class="info-item"><strong>Sunday:</strong> {{sunday_hours}}</div>
+                            <div class="info-item"><strong>Address:</strong> {{address}}</div>
+                            <div class="info-item"><strong>Contact:</strong> {{whatsapp_number}}</div>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            
+            <div class="other-products">
+                <h2>Other Products</h2>
+                <div class="products-scroll">{{other_products}}</div>
+            </div>
+        </div>
+        
+        <footer class="main-footer">
+            <div class="footer-content">
+                <div class="footer-section">
+                    <h3>{{business_name}}</h3>
+                    <p>📍 {{address}}</p>
+                </div>
+                <div class="footer-section">
+                    <h3>Connect</h3>
+                    <a href="https://instagram.com/{{instagram_handle}}" target="_blank">📷 Instagram</a>
+                    <a href="{{whatsapp_url}}" target="_blank">📱 WhatsApp</a>
+                </div>
+            </div>
+        </footer>
+    </body>
+    </html>
+    '''
+
+OTHER_PRODUCT_TEMPLATE = '''
+            <a href="product-{{product_id}}.html" class="other-product">
+                {{thumbnail}}
+                <span>{{product_name}}</span>
+                <span class="price">{{price}}</span>
+            </a>
+            '''
+CATALOG_PAGE_TEMPLATE = '''
+    <!DOCTYPE html>
+    <html lang="en">
+{{head}}
+    <body>
+{{nav}}
+
+        <div class="container">
+            <section id="products" class="products-section">
+                <h2>Our Delicious Ready-to-Order Products</h2>
+                <p class="section-subtitle">Page {{page}} of {{page_count}}</p>
+
+                <div class="products-grid">
+                    {{products}}
+                </div>{{pagination}}
+            </section>
+        </div>
+
+        <footer class="main-footer">
+            <div class="footer-content">
+                <div class="footer-section">
+                    <h3>{{business_name}}</h3>
+                    <p>📍 {{address}}</p>
+                </div>
+            </div>
+        </footer>
+    </body>
+    </html>
+    '''
+
+BROWSE_PAGE_TEMPLATE = '''
+    <!DOCTYPE html>
+    <html lang="en">
+{{head}}
+    <body>
+{{nav}}
+
+        <div class="container">
+            <section id="products" class="products-section">
+                <h2>{{view_title}}</h2>
+                <p class="section-subtitle">{{product_count}} products &middot; page {{page}} of {{page_count}}</p>
+{{facets}}
+
+                <div class="products-grid">
+                    {{products}}
+                </div>{{pagination}}
+            </section>
+        </div>
+
+        <footer class="main-footer">
+            <div class="footer-content">
+                <div class="footer-section">
+                    <h3>{{business_name}}</h3>
+                    <p>📍 {{address}}</p>
+                </div>
+            </div>
+        </footer>
+    </body>
+    </html>
+    '''
+
+SERVICE_WORKER_TEMPLATE = '''// Generated by final_website_complete.py, do not edit
+var VERSION = '{{version}}';
+var PRECACHE = {{precache}};
+var PRECACHE_CACHE = 'precache-' + VERSION;
+var PAGE_CACHE = 'pages';
+var PAGE_CACHE_ENTRIES = {{page_cache_entries}};
+var IMAGE_CACHE = 'images';
+var IMAGE_CACHE_ENTRIES = {{image_cache_entries}};
+var OPAQUE_IMAGE_CACHE = 'images-opaque';
+var OPAQUE_IMAGE_CACHE_ENTRIES = {{opaque_image_cache_entries}};
+var NETWORK_TIMEOUT = {{network_timeout}};
+var scope = self.registration.scope;
+
+function precacheKey(path) {
+    return new URL(path + '?__rev=' + PRECACHE[path], scope).href;
+}
+
+self.addEventListener('install', function (event) {
+    // Files whose revision did not change are copied from the previous precache
+    event.waitUntil(caches.open(PRECACHE_CACHE).then(function (cache) {
+        return Promise.all(Object.keys(PRECACHE).map(function (path) {
+            var key = precacheKey(path);
+            return caches.match(key).then(function (cached) {
+                if (cached) return cache.put(key, cached);
+                return fetch(new URL(path, scope).href, {cache: 'no-cache'}).then(function (response) {
+                    if (!response.ok) throw new Error('Precache failed for ' + path);
+                    return cache.put(key, response);
+                });
+            });
+        }));
+    }).then(function () { return self.skipWaiting(); }));
+});
+
+self.addEventListener('activate', function (event) {
+    event.waitUntil(caches.keys().then(function (names) {
+        return Promise.all(names.filter(function (name) {
+            return name.lastIndexOf('precache-', 0) === 0 && name !== PRECACHE_CACHE;
+        }).map(function (name) { return caches.delete(name); }));
+    }).then(function () { return self.clients.claim(); }));
+});
+
+function networkFirst(request) {
+    return caches.open(PAGE_CACHE).then(function (cache) {
+        var network = fetch(request).then(function (response) {
+            if (response.ok) putRecent(cache, request, response.clone(), PAGE_CACHE_ENTRIES);
+            return response;
+        });
+        var timeout = new Promise(function (resolve) { setTimeout(resolve, NETWORK_TIMEOUT); });
+        var fallback = function () {
+            return cache.match(request).then(function (cached) { return cached || network; });
+        };
+        return Promise.race([network, timeout.then(fallback)]).catch(fallback);
+    });
+}
+
+function imageCacheFirst(request) {
+    return cachedImage(request, IMAGE_CACHE, IMAGE_CACHE_ENTRIES).then(function (cached) {
+        return cached || cachedImage(request, OPAQUE_IMAGE_CACHE, OPAQUE_IMAGE_CACHE_ENTRIES);
+    }).then(function (cached) {
+        return cached || fetch(request).then(function (response) {
+            if (response.ok) {
+                rememberImage(request, response.clone(), IMAGE_CACHE, IMAGE_CACHE_ENTRIES);
+            } else if (response.type === 'opaque') {
+                rememberImage(request, response.clone(), OPAQUE_IMAGE_CACHE, OPAQUE_IMAGE_CACHE_ENTRIES);
+            }
+            return response;
+        });
+    });
+}
+
+function cachedImage(request, name, limit) {
+    // A hit is stored again so it becomes the most recently used entry
+    return caches.open(name).then(function (cache) {
+        return cache.match(request).then(function (cached) {
+            if (!cached) return undefined;
+            return putRecent(cache, request, cached.clone(), limit).then(function () { return cached; });
+        });
+    });
+}
+
+function rememberImage(request, response, name, limit) {
+    return caches.open(name).then(function (cache) { return putRecent(cache, request, response, limit); });
+}
+
+function putRecent(cache, request, response, limit) {
+    // Deleting first moves the entry to the end of the cache's key order,
+    // so the oldest entries are the first keys
+    return cache.delete(request).then(function () {
+        return cache.put(request, response);
+    }).then(function () {
+        return cache.keys();
+    }).then(function (keys) {
+        return Promise.all(keys.slice(0, Math.max(0, keys.length - limit)).map(function (key) {
+            return cache.delete(key);
+        }));
+    });
+}
+
+self.addEventListener('fetch', function (event) {
+    var request = event.request;
+    if (request.method !== 'GET') return;
+    var url = new URL(request.url);
+    var path = url.origin + url.pathname === scope ? 'index.html' : (url.origin + url.pathname).slice(scope.length);
+    if (request.url.lastIndexOf(scope, 0) === 0 && PRECACHE.hasOwnProperty(path)) {
+        event.respondWith(caches.match(precacheKey(path)).then(function (cached) {
+            return cached || fetch(request);
+        }));
+    } else if (request.destination === 'image') {
+        event.respondWith(imageCacheFirst(request));
+    } else if (request.mode === 'navigate' && request.url.lastIndexOf(scope, 0) === 0) {
+        event.respondWith(networkFirst(request));
+    }
+});
+'''
+
+FACETS_TEMPLATE = '''
+                <nav class="browse-facets">
+                    {{groups}}
+                </nav>'''
+
+PAGINATION_TEMPLATE = '''
+                <nav class="pagination">
+                    {{links}}
+                </nav>'''
+
+SHARD_LOADER_TEMPLATE = '''
+                <div id="catalog-more" class="catalog-more" data-shards="{{shard_count}}">Loading more products...</div>
+                <script>
+                (function () {
+                    var grid = document.querySelector('#products .products-grid');
+                    var more = document.getElementById('catalog-more');
+                    var total = parseInt(more.dataset.shards, 10);
+                    var next = 1;
+                    var loading = false;
+                    function load() {
+                        if (loading || next > total) return;
+                        loading = true;
+                        fetch('catalog/products-' + next + '.json')
+                            .then(function (response) { return response.json(); })
+                            .then(function (cards) {
+                                grid.insertAdjacentHTML('beforeend', cards.join(''));
+                                next += 1;
+                                loading = false;
+                                if (next > total) {
+                                    observer.disconnect();
+                                    more.remove();
+                                }
+                            })
+                            .catch(function () { loading = false; });
+                    }
+                    var observer = new IntersectionObserver(function (entries) {
+                        if (entries[0].isIntersecting) load();
+                    }, { rootMargin: '800px' });
+                    observer.observe(more);
+                })();
+                </script>'''
+SEARCH_BOX_TEMPLATE = '''
+                <div class="search-box" data-block-size="{{doc_block_size}}" data-prefix-length="{{prefix_length}}"
+                     data-max-results="{{max_results}}" data-folder="{{search_folder}}">
+                    <input type="search" id="product-search" placeholder="🔎 Search products..." autocomplete="off">
+                    <ul id="search-results" class="search-results"></ul>
+                </div>
+                <script>
+                (function () {
+                    var box = document.querySelector('.search-box');
+                    var input = document.getElementById('product-search');
+                    var list = document.getElementById('search-results');
+                    var blockSize = parseInt(box.dataset.blockSize, 10);
+                    var prefixLength = parseInt(box.dataset.prefixLength, 10);
+                    var maxResults = parseInt(box.dataset.maxResults, 10);
+                    var shards = {};
+                    var latest = 0;
+                    function shard(name) {
+                        if (!shards[name]) {
+                            shards[name] = fetch(box.dataset.folder + '/' + name + '.json')
+                                .then(function (response) { return response.ok ? response.json() : {}; })
+                                .catch(function () { return {}; });
+                        }
+                        return shards[name];
+                    }
+                    function tokenize(text) {
+                        return text.normalize('NFKD').replace(/[\\u0300-\\u036f]/g, '').toLowerCase().match(/[a-z0-9]+/g) || [];
+                    }
+                    function matchWord(word) {
+                        return shard('terms-' + word.slice(0, prefixLength)).then(function (terms) {
+                            var scores = {};
+                            Object.keys(terms).forEach(function (term) {
+                                if (term.lastIndexOf(word, 0) !== 0) return;
+                                terms[term].forEach(function (code) {
+                                    var doc = code >> 1;
+                                    scores[doc] = Math.max(scores[doc] || 0, (code & 1) + 1);
+                                });
+                            });
+                            return scores;
+                        });
+                    }
+                    function show(query, docs, blocks) {
+                        list.innerHTML = '';
+                        docs.forEach(function (doc) {
+                            var product = blocks[Math.floor(doc / blockSize)][doc % blockSize];
+                            var item = document.createElement('li');
+                            var link = document.createElement('a');
+                            var price = document.createElement('span');
+                            link.href = 'product-' + product[0] + '.html';
+                            link.textContent = product[1];
+                            price.className = 'price';
+                            price.textContent = product[2];
+                            link.appendChild(price);
+                            item.appendChild(link);
+                            list.appendChild(item);
+                        });
+                        if (!docs.length) {
+                            var empty = document.createElement('li');
+                            empty.className = 'no-results';
+                            empty.textContent = 'No products match "' + query + '"';
+                            list.appendChild(empty);
+                        }
+                    }
+                    function search(query) {
+                        var request = ++latest;
+                        var words = tokenize(query).filter(function (word) { return word.length >= prefixLength; });
+                        if (!words.length) {
+                            list.innerHTML = '';
+                            return;
+                        }
+                        Promise.all(words.map(matchWord)).then(function (matches) {
+                            var totals = {};
+                            Object.keys(matches[0]).forEach(function (doc) {
+                                var score = 0;
+                                for (var i = 0; i < matches.length; i++) {
+                                    if (!(doc in matches[i])) return;
+                                    score += matches[i][doc];
+                                }
+                                totals[doc] = score;
+                            });
+                            var docs = Object.keys(totals).map(Number).sort(function (a, b) {
+                                return totals[b] - totals[a] || a - b;
+                            }).slice(0, maxResults);
+                            var blockNumbers = docs.map(function (doc) { return Math.floor(doc / blockSize); })
+                                .filter(function (block, i, all) { return all.indexOf(block) === i; });
+                            return Promise.all(blockNumbers.map(function (block) { return shard('docs-' + block); }))
+                                .then(function (loaded) {
+                                    var blocks = {};
+                                    blockNumbers.forEach(function (block, i) { blocks[block] = loaded[i]; });
+                                    if (request === latest) show(query, docs, blocks);
+                                });
+                        });
+                    }
+                    var timer;
+                    input.addEventListener('input', function () {
+                        clearTimeout(timer);
+                        timer = setTimeout(function () { search(input.value); }, 80);
+                    });
+                })();
+                </script>'''
+
+REDIRECT_TEMPLATE = '''<!DOCTYPE html>
+<html lang="en"><head><meta charset="UTF-8"><title>{{title}}</title>
+<meta http-equiv="refresh" content="0; url={{target}}"><link rel="canonical" href="{{target}}">
+<script>location.replace({{target_js}});</script></head>
+<body><a href="{{target}}">{{title}}</a></body></html>
+'''
+
+TEMPLATES = {
+    'head': HEAD_TEMPLATE,
+    'nav': NAV_TEMPLATE,
+    'index': INDEX_TEMPLATE,
+    'product_card': PRODUCT_CARD_TEMPLATE,
+    'contact': CONTACT_TEMPLATE,
+    'about': ABOUT_TEMPLATE,
+    'product': PRODUCT_TEMPLATE,
+    'other_product': OTHER_PRODUCT_TEMPLATE,
+    'catalog_page': CATALOG_PAGE_TEMPLATE,
+    'browse_page': BROWSE_PAGE_TEMPLATE,
+    'facets': FACETS_TEMPLATE,
+    'service_worker': SERVICE_WORKER_TEMPLATE,
+    'pagination': PAGINATION_TEMPLATE,
+    'shard_loader': SHARD_LOADER_TEMPLATE,
+    'search_box': SEARCH_BOX_TEMPLATE,
+    'redirect': REDIRECT_TEMPLATE
+}
+PAGE_FRAGMENTS = ('head', 'nav')
+TEMPLATE_FIELD = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+class PageTemplate:
+    """Template with {{field}} placeholders, parsed once into parts
+
+    parts alternates literal text and field names. bind() fills some fields
+    ahead of time (shared fragments, business details) and returns a new
+    template, so per-page rendering only joins the remaining parts.
+    """
+    
+    def __init__(self, text):
+        self.text = text
+        self.parts = []
+        position = 0
+        for match in TEMPLATE_FIELD.finditer(text):
+            self.parts.append(text[position:match.start()])
+            self.parts.append(match.group(1))
+            position = match.end()
+        self.parts.append(text[position:])
+        self.fields = set(self.parts[1::2])
+    
+    def bind(self, **values):
+        """Fill the given fields now and keep the others as placeholders"""
+        chunks = []
+        for position, part in enumerate(self.parts):
+            if position % 2 == 0:
+                chunks.append(part)
+            elif part in values:
+                chunks.append(str(values[part]))
+            else:
+                chunks.append('{{' + part + '}}')
+        return PageTemplate(''.join(chunks))
+    
+    def iter_chunks(self, values):
+        """Yield the rendered text piece by piece; iterable values are expanded"""
+        for position, part in enumerate(self.parts):
+            if position % 2 == 0:
+                yield part
+                continue
+            value = values[part]
+            if isinstance(value, str):
+                yield value
+            elif hasattr(value, '__iter__'):
+                yield from value
+            else:
+                yield str(value)
+    
+    def render(self, **values):
+        return ''.join(self.iter_chunks(values))
     
-    with open(os.path.join(folder, 'contact.html'), 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    print("📄 Created: contact.html with FIXED Instagram link")
+    def stream(self, f, **values):
+        """Write the rendered template straight to an open file"""
+        for chunk in self.iter_chunks(values):
+            f.write(chunk)
+
+_compiled_templates = {}
+_site_templates = {}
+_asset_names = {'styles.css': 'styles.css', 'qr_extension': 'png', 'service_worker': ''}
+
+def get_template(name):
+    """Compiled template by name, parsed once per process"""
+    if name not in _compiled_templates:
+        _compiled_templates[name] = PageTemplate(TEMPLATES[name])
+    return _compiled_templates[name]
+
+def get_site_templates():
+    """Page templates with head, nav and business details already filled in
+
+    Shared fragments are rendered once per BUSINESS_INFO and reused for
+    every page, so rendering a page only fills in its own fields.
+    """
+    key = hash_text(hash_business_info(), json.dumps(_asset_names, sort_keys=True))
+    if key not in _site_templates:
+        business = business_fields()
+        service_worker = ''
+        if _asset_names['service_worker']:
+            service_worker = ('\n        <script>if (\'serviceWorker\' in navigator) '
+                              f"navigator.serviceWorker.register('{_asset_names['service_worker']}');</script>")
+        head = get_template('head').bind(stylesheet=_asset_names['styles.css'], service_worker=service_worker).text
+        nav = {}
+        for active in ('index', 'about', 'contact', None):
+            nav[active] = get_template('nav').bind(
+                home_class=' class="active"' if active == 'index' else '',
+                about_class=' class="active"' if active == 'about' else '',
+                contact_class=' class="active"' if active == 'contact' else '',
+            ).text
+        
+        search_box = get_template('search_box').bind(
+            search_folder=SEARCH_SETTINGS['folder'],
+            prefix_length=SEARCH_SETTINGS['prefix_length'],
+            doc_block_size=SEARCH_SETTINGS['doc_block_size'],
+            max_results=SEARCH_SETTINGS['max_results']
+        ).text
+
+        def bind_page(name, title, active=None):
+            page = get_template(name).bind(head=head, nav=nav[active], search_box=search_box,
+                                           qr_extension=_asset_names['qr_extension'])
+            return page.bind(title=title).bind(**business)
+        
+        _site_templates[key] = {
+            'index': bind_page('index', '{{business_name}}', 'index'),
+            'contact': bind_page('contact', 'Contact Us | {{business_name}}', 'contact'),
+            'about': bind_page('about', 'About Us | {{business_name}}', 'about'),
+            'product': bind_page('product', '{{product_name}} | {{business_name}}'),
+            'catalog_page': bind_page('catalog_page', 'Products (page {{page}}) | {{business_name}}', 'index'),
+            'browse_page': bind_page('browse_page', '{{view_title}} | {{business_name}}', 'index'),
+            'shard_loader': get_template('shard_loader'),
+            'product_card': get_template('product_card').bind(qr_extension=_asset_names['qr_extension'], **business),
+            'other_product': get_template('other_product')
+        }
+    return _site_templates[key]
+
+def business_fields():
+    """BUSINESS_INFO flattened into template fields"""
+    fields = {key: value for key, value in BUSINESS_INFO.items() if isinstance(value, str)}
+    fields['weekday_hours'] = BUSINESS_INFO['business_hours']['weekdays']
+    fields['sunday_hours'] = BUSINESS_INFO['business_hours']['sunday']
+    return fields
+
+def product_fields(product):
+    """Template fields of one product"""
+    return {column: product[column] for column in PRODUCT_COLUMNS}
+
+def whatsapp_link(message=None):
+    """wa.me link to the business, optionally with a prefilled message"""
+    url = f"https://wa.me/{BUSINESS_INFO['whatsapp_number']}"
+    if message:
+        url += '?text=' + urllib.parse.quote(message, safe='')
+    return url
+
+def order_link(product):
+    """WhatsApp link that starts an order for a product"""
+    return whatsapp_link(f"Hello! I'd like to order: {product['product_name']} - {product['price']}")
+
+def create_index_page(products, folder, page_count=1, shard_count=0, facets=''):
+    """Create main page with custom cakes section and reordered sections
+
+    products are the cards shown on index.html itself. When the catalog is
+    split, page_count adds links to the numbered pages and shard_count adds
+    the script that loads the remaining cards from JSON shards. facets is
+    the rendered bar of links to the browse views.
+    """
+    templates = get_site_templates()
+    cards = render_product_cards(products, templates['product_card'])
+    if shard_count:
+        more = templates['shard_loader'].render(shard_count=shard_count)
+    else:
+        more = render_pagination(1, page_count)
+    write_output(folder, 'index.html', templates['index'].iter_chunks({
+        'products': cards,
+        'pagination': more,
+        'facets': facets
+    }))
+
+def create_catalog_index(products, folder, build, settings, row_hashes, business_hash, facets=''):
+    """Create index.html and, for large catalogs, its extra pages or shards
+
+    index.html only ever holds the first page_size products, so the first
+    screen stays the same size however large the catalog grows.
+    """
+    mode = settings['mode']
+    if mode not in ('single', 'pages', 'shards'):
+        raise ValueError(f"Unknown index mode: {mode}")
+    page_size = max(1, settings['page_size'])
+    first_page = products if mode == 'single' else products[:page_size]
+    rest = products[len(first_page):]
+
+    def hashes(chunk):
+        return [row_hashes[product.product_id] for product in chunk]
+
+    pages = chunk_list(rest, page_size) if mode == 'pages' else []
+    shards = chunk_list(rest, max(1, settings['shard_size'])) if mode == 'shards' else []
+    page_count = len(pages) + 1
+
+    index_hash = hash_template(create_index_page, *PAGE_FRAGMENTS, 'index', 'search_box', 'product_card',
+                               'pagination', 'shard_loader')
+    if build.is_stale('index.html', index_hash, json.dumps(SEARCH_SETTINGS, sort_keys=True), business_hash,
+                      facets, page_count, len(shards), *hashes(first_page)):
+        create_index_page(first_page, folder, page_count, len(shards), facets)
+
+    page_hash = hash_template(create_catalog_page, *PAGE_FRAGMENTS, 'catalog_page', 'product_card', 'pagination')
+    for number, page in enumerate(pages, start=2):
+        if build.is_stale(catalog_page_name(number), page_hash, business_hash, page_count, *hashes(page)):
+            create_catalog_page(page, folder, number, page_count)
+
+    shard_hash = hash_template(create_catalog_shard, 'product_card')
+    for number, shard in enumerate(shards, start=1):
+        if build.is_stale(catalog_shard_name(number), shard_hash, business_hash, *hashes(shard)):
+            create_catalog_shard(shard, folder, number)
+
+def create_catalog_page(products, folder, number, page_count):
+    """Create products-<n>.html, one page of a paginated catalog"""
+    templates = get_site_templates()
+    cards = render_product_cards(products, templates['product_card'])
+    write_output(folder, catalog_page_name(number), templates['catalog_page'].iter_chunks({
+        'products': cards,
+        'page': number,
+        'page_count': page_count,
+        'pagination': render_pagination(number, page_count)
+    }))
+
+def create_catalog_shard(products, folder, number):
+    """Create catalog/products-<n>.json with pre-rendered product cards"""
+    card_template = get_site_templates()['product_card']
+    cards = list(render_product_cards(products, card_template))
+    write_output(folder, catalog_shard_name(number), json.dumps(cards, ensure_ascii=False, separators=(',', ':')))
+
+def catalog_views(products):
+    """Sorted and filtered listings of the catalog for the browse pages
+
+    Returns {slug: (group, title, products)}. The catalog is sorted by
+    price once; the price bands are slices of that order found by
+    bisection and the manufacturer views are filtered from it, so every
+    listing except "most expensive first" is cheapest first. Products
+    without a parsable price only appear in their manufacturer's view.
+    """
+    priced = [product for product in products if product.price_kobo is not None]
+    ascending = sorted(priced, key=lambda product: product.price_kobo)
+    prices = [product.price_kobo for product in ascending]
+    views = {
+        'price-low-to-high': ('Sort', 'Cheapest first', ascending),
+        'price-high-to-low': ('Sort', 'Most expensive first', ascending[::-1])
+    }
+
+    limits = BROWSE_SETTINGS['price_bands']
+    for lower, upper in zip([0] + limits, limits + [None]):
+        start = bisect.bisect_left(prices, lower * 100)
+        end = bisect.bisect_left(prices, upper * 100) if upper else len(prices)
+        if start == end:
+            continue
+        if not lower:
+            views[f"under-{upper}"] = ('Price', f"Under ₦{upper:,}", ascending[start:end])
+        elif upper:
+            views[f"{lower}-to-{upper}"] = ('Price', f"₦{lower:,} – ₦{upper:,}", ascending[start:end])
+        else:
+            views[f"{lower}-and-above"] = ('Price', f"₦{lower:,} and above", ascending[start:end])
+
+    makers = {}
+    for product in ascending + [product for product in products if product.price_kobo is None]:
+        makers.setdefault(product.manufacturer, []).append(product)
+    for manufacturer, listing in makers.items():
+        slug = 'by-' + ('-'.join(tokenize(manufacturer)) or 'unknown')
+        while slug in views:
+            slug += '-more'
+        views[slug] = ('Made by', manufacturer or 'Unknown', listing)
+    return views
+
+def render_facets(views):
+    """Links to every browse view, grouped as Sort / Price / Made by"""
+    if not views:
+        return ''
+    groups = {}
+    for slug, (group, title, listing) in views.items():
+        groups.setdefault(group, []).append(f'<a href="{browse_page_name(slug, 1)}#products">{html.escape(title)}</a>')
+    return get_template('facets').render(groups='\n                    '.join(
+        f'<span class="facet-group"><strong>{group}:</strong> {" ".join(links)}</span>' for group, links in groups.items()))
+
+def create_browse_pages(views, folder, build, facets, page_hashes, business_hash):
+    """Write browse-<view>[-<n>].html for every view, page_size products per page"""
+    page_size = max(1, BROWSE_SETTINGS['page_size'])
+    template_hash = hash_template(create_browse_page, *PAGE_FRAGMENTS, 'browse_page', 'product_card', 'pagination')
+    written = pages = 0
+    for slug, (group, title, listing) in views.items():
+        chunks = chunk_list(listing, page_size)
+        for number, chunk in enumerate(chunks, start=1):
+            pages += 1
+            if build.is_stale(browse_page_name(slug, number), template_hash, business_hash, facets, title,
+                              len(listing), len(chunks), *[page_hashes[product.product_id] for product in chunk]):
+                create_browse_page(chunk, folder, slug, title, number, len(chunks), len(listing), facets)
+                written += 1
+    _build_report.log(f"🗂️ Created: {len(views)} browse views ({pages} pages, {written} updated)")
+
+def create_browse_page(products, folder, slug, title, number, page_count, product_count, facets):
+    templates = get_site_templates()
+    cards = render_product_cards(products, templates['product_card'])
+    write_output(folder, browse_page_name(slug, number), templates['browse_page'].iter_chunks({
+        'view_title': html.escape(title),
+        'product_count': product_count,
+        'products': cards,
+        'page': number,
+        'page_count': page_count,
+        'facets': facets,
+        'pagination': render_pagination(number, page_count, functools.partial(browse_page_name, slug))
+    }))
+
+def browse_page_name(slug, number):
+    return f"browse-{slug}.html" if number == 1 else f"browse-{slug}-{number}.html"
+
+def create_search_index(products, folder, build):
+    """Write the client-side search index as small JSON shards
+
+    terms-<prefix>.json maps every token starting with that prefix to its
+    postings, encoded as doc * 2 + 1 for name matches and doc * 2 for
+    description-only matches (doc is the catalog position).
+    docs-<block>.json holds the id, name and price of each doc for display.
+    Only shards whose content changed are rewritten.
+    """
+    prefix_length = SEARCH_SETTINGS['prefix_length']
+    block_size = SEARCH_SETTINGS['doc_block_size']
+
+    postings = {}
+    for doc, product in enumerate(products):
+        for token in tokenize(product.description):
+            postings.setdefault(token, {}).setdefault(doc, 0)
+        for token in tokenize(product.product_name):
+            postings.setdefault(token, {})[doc] = 1
+
+    shards = {}
+    for token in sorted(postings):
+        if len(token) < prefix_length:
+            continue
+        docs = postings[token]
+        shards.setdefault(f"terms-{token[:prefix_length]}", {})[token] = [doc * 2 + docs[doc] for doc in sorted(docs)]
+    for block, chunk in enumerate(chunk_list(products, block_size)):
+        shards[f"docs-{block}"] = [[product.product_id, product.product_name, product.price] for product in chunk]
+
+    written = 0
+    for name, data in shards.items():
+        if write_json_output(build, folder, f"{SEARCH_SETTINGS['folder']}/{name}.json", data):
+            written += 1
+    _build_report.count('search_shards_written', written)
+    _build_report.log(f"🔎 Created: search index ({len(postings)} terms, {len(shards)} shards, {written} updated)")
+
+def tokenize(text):
+    """Lowercase ASCII words of a text, with accents stripped
+
+    Must stay in step with tokenize() in the search box script.
+    """
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+def write_json_output(build, folder, filename, data):
+    """Write a JSON output when its content changed, returning whether it did"""
+    content = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    if not build.is_stale(filename, content):
+        return False
+    write_output(folder, filename, content)
+    return True
+
+def catalog_page_name(number):
+    return 'index.html' if number == 1 else f"products-{number}.html"
 
-# [Keep the other functions: create_product_page, create_about_page, create_qr_codes, create_styles]
-# But I'll update the create_styles function to include new styles
+def catalog_shard_name(number):
+    return f"catalog/products-{number}.json"
 
-def create_styles(folder):
-    """Create CSS styles with custom cakes section and fixed Instagram button"""
-    css_content = '''
+def chunk_list(items, size):
+    """Split a list into consecutive chunks of at most size items"""
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+def render_pagination(current, page_count, page_name=catalog_page_name):
+    """Numbered page links around the current page, with first/last always shown"""
+    if page_count <= 1:
+        return ''
+    numbers = sorted({1, page_count, *range(max(1, current - 2), min(page_count, current + 2) + 1)})
+    links = []
+    if current > 1:
+        links.append(f'<a href="{page_name(current - 1)}#products" rel="prev">&laquo; Prev</a>')
+    previous = 0
+    for number in numbers:
+        if number - previous > 1:
+            links.append('<span class="gap">&hellip;</span>')
+        if number == current:
+            links.append(f'<span class="current">{number}</span>')
+        else:
+            links.append(f'<a href="{page_name(number)}#products">{number}</a>')
+        previous = number
+    if current < page_count:
+        links.append(f'<a href="{page_name(current + 1)}#products" rel="next">Next &raquo;</a>')
+    return get_template('pagination').render(links='\n                    '.join(links))
+
+def render_product_cards(products, card_template):
+    """Yield the index page product cards one at a time"""
+    for row in iter_products(products):
+        whatsapp_url = whatsapp_link(f"Hello! I'm interested in: {row['product_name']} - {row['price']}")
+        yield card_template.render(whatsapp_url=whatsapp_url, short_description=row['description'][:80],
+                                   thumbnail=render_picture(row, 'thumb', 'product-thumbnail'),
+                                   **product_fields(row))
+
+def create_contact_page(folder):
+    """Create contact page with FIXED Instagram link"""
+    write_output(folder, 'contact.html', get_site_templates()['contact'].iter_chunks({}))
+
+STYLESHEET = '''
     * { margin: 0; padding: 0; box-sizing: border-box; }
     body { font-family: Arial, sans-serif; background: #f5f5f5; line-height: 1.6; }
     .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
@@ -427,6 +2057,26 @@ def create_styles(folder):
     .whatsapp-btn-small:hover { background: #1DA851; }
     .qr-btn { background: #E1306C; }
     .qr-btn:hover { background: #C13584; }
+
+    .pagination { display: flex; gap: 0.5rem; justify-content: center; flex-wrap: wrap; margin: 2rem 0; }
+    .pagination a, .pagination span { padding: 0.5rem 0.9rem; border-radius: 5px; background: white; color: #008751; text-decoration: none; }
+    .pagination .current { background: #008751; color: white; font-weight: bold; }
+    .pagination .gap { background: none; color: #666; }
+    .catalog-more { text-align: center; color: #666; padding: 2rem 0; }
+
+    .search-box { max-width: 600px; margin: 0 auto 2rem; position: relative; }
+    .search-box input { width: 100%; padding: 0.9rem 1.2rem; border: 2px solid #008751; border-radius: 25px; font-size: 1rem; }
+    .search-results { list-style: none; background: white; border-radius: 10px; margin-top: 0.5rem; box-shadow: 0 10px 25px rgba(0,0,0,0.1); }
+    .search-results:empty { display: none; }
+    .search-results a { display: flex; justify-content: space-between; padding: 0.75rem 1.2rem; color: #333; text-decoration: none; border-bottom: 1px solid #eee; }
+    .search-results a:hover { background: #e8f5e8; }
+    .search-results .price { font-size: 1rem; margin: 0; }
+    .search-results .no-results { padding: 0.75rem 1.2rem; color: #666; }
+
+    .browse-facets { display: flex; flex-direction: column; gap: 0.5rem; align-items: center; margin: 0 auto 2rem; font-size: 0.9rem; }
+    .browse-facets .facet-group { display: flex; flex-wrap: wrap; gap: 0.4rem; justify-content: center; align-items: center; }
+    .browse-facets a { padding: 0.3rem 0.8rem; border: 1px solid #008751; border-radius: 15px; color: #008751; text-decoration: none; }
+    .browse-facets a:hover { background: #008751; color: white; }
     
     /* QR Codes Section */
     .qr-codes-section { background: white; padding: 2rem; border-radius: 10px; margin: 3rem 0; text-align: center; }
@@ -463,27 +2113,1534 @@ def create_styles(folder):
         .hours-grid { grid-template-columns: 1fr; }
     }
     '''
+
+def create_styles(folder, minify=False, fingerprint=False):
+    """Create CSS styles with custom cakes section and fixed Instagram button
+
+    Returns the stylesheet filename, styles.<hash>.css when fingerprinted.
+    """
+    css_content = get_stylesheet(minify)
+    filename = stylesheet_name(css_content, fingerprint)
+
+    write_output(folder, filename, css_content)
+    return filename
+
+def get_stylesheet(minify=False):
+    return minify_css(STYLESHEET) if minify else STYLESHEET
+
+def stylesheet_name(css_content, fingerprint=False):
+    """styles.css, or styles.<content hash>.css so browsers can cache it forever"""
+    if not fingerprint:
+        return 'styles.css'
+    return f"styles.{hashlib.sha256(css_content.encode('utf-8')).hexdigest()[:10]}.css"
+
+def create_product_page(product, folder, all_products, others=None):
+    """Create product page with order buttons and other products"""
+    if others is None:
+        others = get_other_products(product, all_products)
     
-    with open(os.path.join(folder, 'styles.css'), 'w') as f:
-        f.write(css_content)
-    print("🎨 Created: styles.css with custom cakes and fixed Instagram")
-
-# [Keep the other functions unchanged]
-def create_product_page(product, folder, all_products):
-    """Create product page - same as before"""
-    # [Your existing create_product_page function here]
-    pass
-
-def create_about_page(df, folder):
-    """Create about page - same as before"""
-    # [Your existing create_about_page function here]
-    pass
-
-def create_qr_codes(df, folder):
-    """Generate QR codes - same as before"""
-    # [Your existing create_qr_codes function here]
-    pass
+    templates = get_site_templates()
+    whatsapp_url = order_link(product)
+    other_products = (templates['other_product'].render(thumbnail=render_picture(other, 'thumb'),
+                                                        **product_fields(other))
+                      for other in others)
+
+    write_output(folder, f"product-{product['product_id']}.html", templates['product'].iter_chunks({
+        'whatsapp_url': whatsapp_url,
+        'other_products': other_products,
+        'product_image': render_picture(product, 'detail', 'product-image', lazy=False),
+        **product_fields(product)
+    }), product_id=product['product_id'])
+
+def get_other_products(product, all_products, position=None):
+    """Pick the products shown under "Other Products" on a product page
+
+    Only the next OTHER_PRODUCTS_LIMIT products (wrapping around the catalog)
+    are shown, so each page depends on a fixed number of rows instead of the
+    whole catalog.
+    """
+    rows = all_products if isinstance(all_products, list) else list(iter_products(all_products))
+    if position is None:
+        ids = [str(row['product_id']) for row in rows]
+        position = ids.index(str(product['product_id']))
+    count = min(OTHER_PRODUCTS_LIMIT, len(rows) - 1)
+    return [rows[(position + offset) % len(rows)] for offset in range(1, count + 1)]
+
+def create_about_page(products, folder):
+    """Create about page with business information"""
+    write_output(folder, 'about.html', get_site_templates()['about'].iter_chunks({}))
+
+def create_qr_codes(products, folder, cache_folder=QR_CACHE_FOLDER, workers=None):
+    """Generate QR codes for every product, reusing cached PNGs
+
+    QR images are cached by the hash of (URL, error correction, box size,
+    border), so only new or changed products are encoded. Misses are
+    rendered across a process pool when there are enough of them. The QR
+    version and PNG size of every code go into the build report, next to
+    the version the full URL would have needed; the versions are cached in
+    versions.json so they are only worked out for new codes.
+    """
+    os.makedirs(cache_folder, exist_ok=True)
+    known_versions = load_qr_versions(cache_folder)
+    new_versions = {}
+
+    jobs = []
+    codes = []
+    hits = 0
+    for row in iter_products(products):
+        for filename, url, full_url in qr_codes_for(row):
+            target = os.path.join(folder, filename)
+            cached = os.path.join(cache_folder, qr_cache_key(url) + os.path.splitext(filename)[1])
+            codes.append((row['product_id'], filename, url, full_url, target))
+            if os.path.exists(cached):
+                publish_file(cached, target, product_id=row['product_id'])
+                hits += 1
+            else:
+                jobs.append((url, cached, target, row['product_id']))
+
+    if jobs:
+        urls = [url for url, cached, target, product_id in jobs]
+        images = map_in_pool(QR_RENDERERS[QR_SETTINGS['format']], urls, workers)
+        for (url, cached, target, product_id), image in zip(jobs, images):
+            write_atomic(cached, image)
+            publish_file(cached, target, product_id=product_id)
+
+    versions = []
+    full_versions = []
+    for product_id, filename, url, full_url, target in codes:
+        key = hash_text(url, full_url, QR_SETTINGS['error_correction'])
+        if key in known_versions:
+            version, full_version = known_versions[key]
+        else:
+            version = qr_version(url)
+            full_version = qr_version(full_url) if full_url != url else version
+            new_versions[key] = [version, full_version]
+        versions.append(version)
+        full_versions.append(full_version)
+        _build_report.record('qr_codes', product_id=product_id, file=filename, url=url,
+                             payload_bytes=len(url.encode('utf-8')), version=version,
+                             full_url_version=full_version, png_bytes=os.path.getsize(target))
+
+    if new_versions:
+        save_qr_versions(cache_folder, {**known_versions, **new_versions})
+
+    _build_report.count('qr_cache_hits', hits)
+    _build_report.count('qr_cache_misses', len(jobs))
+    _build_report.log(f"📱 Created: {hits + len(jobs)} QR codes ({hits} cached, {len(jobs)} encoded)")
+    if codes:
+        payload = sum(len(url.encode('utf-8')) for product_id, filename, url, full_url, target in codes) / len(codes)
+        full_payload = sum(len(full_url.encode('utf-8')) for product_id, filename, url, full_url, target in codes) / len(codes)
+        _build_report.log(f"📏 QR density: {payload:.0f} bytes, up to version {max(versions)} "
+                          f"({qr_modules(max(versions))} modules wide) vs {full_payload:.0f} bytes, "
+                          f"up to version {max(full_versions)} ({qr_modules(max(full_versions))}) with full URLs")
+    return {'hits': hits, 'misses': len(jobs)}
+
+def load_qr_versions(cache_folder):
+    try:
+        with open(os.path.join(cache_folder, 'versions.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_qr_versions(cache_folder, versions):
+    data = json.dumps(versions, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    write_atomic(os.path.join(cache_folder, 'versions.json'), data)
+
+def qr_codes_for(product):
+    """(filename, encoded URL, full URL) of every QR code printed for a product"""
+    extension = QR_SETTINGS['format']
+    yield f"qr-{product['product_id']}.{extension}", get_product_url(product), get_page_url(product)
+    if SHORT_LINK_SETTINGS['enabled'] and SHORT_LINK_SETTINGS['order_qr']:
+        yield (f"qr-order-{product['product_id']}.{extension}", short_link(SHORT_LINK_SETTINGS['order_prefix'], product),
+               order_link(product))
+
+def get_product_url(product):
+    """URL encoded in a product's QR code: its short link when enabled"""
+    if SHORT_LINK_SETTINGS['enabled']:
+        return short_link(SHORT_LINK_SETTINGS['product_prefix'], product)
+    return get_page_url(product)
+
+def get_page_url(product):
+    """Public URL of a product page"""
+    return f"{SITE_URL}product-{product['product_id']}.html"
+
+def short_link(prefix, product):
+    return f"{SHORT_LINK_SETTINGS['base_url']}{prefix}/{product['product_id']}"
+
+def create_short_links(products, folder, build, row_hashes, business_hash):
+    """Write the static redirect pages behind the short links
+
+    <product_prefix>/<id>.html opens the product page and
+    <order_prefix>/<id>.html starts a WhatsApp order for the product.
+    A page is only rendered when its product row, the business details or
+    the redirect template changed.
+    """
+    template = get_template('redirect')
+    template_hash = hash_template(create_short_links, 'redirect')
+    written = 0
+    for product in products:
+        product_id = product['product_id']
+        row_hash = row_hashes[product_id]
+        product_page = f"{SHORT_LINK_SETTINGS['product_prefix']}/{product_id}.html"
+        order_page = f"{SHORT_LINK_SETTINGS['order_prefix']}/{product_id}.html"
+        pages = []
+        if build.is_stale(product_page, template_hash, business_hash, row_hash):
+            pages.append((product_page, f"../product-{product_id}.html", product['product_name']))
+        if build.is_stale(order_page, template_hash, business_hash, row_hash):
+            pages.append((order_page, order_link(product), f"Order {product['product_name']}"))
+        for filename, target, title in pages:
+            content = template.render(title=html.escape(title), target=html.escape(target),
+                                      target_js=json.dumps(target).replace('<', '\\u003c'))
+            write_output(folder, filename, content, product_id=product_id)
+            written += 1
+    _build_report.log(f"🔗 Created: short links for {len(products)} products ({written} updated)")
+
+def qr_version(url):
+    """Smallest QR version that fits url at the configured error correction"""
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{QR_SETTINGS['error_correction']}")
+    )
+    qr.add_data(url)
+    return qr.best_fit()
+
+def qr_modules(version):
+    """Width of a QR symbol in modules, without the quiet zone"""
+    return 17 + 4 * version
+
+def qr_cache_key(url):
+    """Content address of a QR image: everything that changes its pixels"""
+    return hash_text(url, QR_SETTINGS['error_correction'], QR_SETTINGS['box_size'], QR_SETTINGS['border'])
+
+def map_in_pool(function, items, workers=None):
+    """function(item) for every item, across a process pool for large batches"""
+    workers = workers or os.cpu_count() or 1
+    if len(items) >= QR_PARALLEL_THRESHOLD and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(items) // (workers * 4))
+            return list(pool.map(function, items, chunksize=chunksize))
+    return [function(item) for item in items]
+
+def qr_matrix(url):
+    """Module rows of the QR code for url, without the quiet zone, as '0'/'1' strings"""
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{QR_SETTINGS['error_correction']}"),
+        border=0
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+    return [''.join('1' if module else '0' for module in row) for row in qr.get_matrix()]
+
+def qr_runs(matrix):
+    """(x, y, length) of every horizontal run of dark modules"""
+    for y, row in enumerate(matrix):
+        x = 0
+        for module, run in itertools.groupby(row):
+            length = len(list(run))
+            if module == '1':
+                yield x, y, length
+            x += length
+
+def qr_svg_path(matrix, offset=0):
+    """SVG path data drawing all dark modules, one subpath per run"""
+    return ''.join(f"M{x + offset} {y + offset}h{length}v1h-{length}z" for x, y, length in qr_runs(matrix))
+
+def render_qr_svg(url):
+    """Encode one QR code as a compact SVG, returning its bytes"""
+    matrix = qr_matrix(url)
+    border = QR_SETTINGS['border']
+    size = len(matrix) + 2 * border
+    pixels = size * QR_SETTINGS['box_size']
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+            f'viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+            f'<rect width="{size}" height="{size}" fill="#fff"/>'
+            f'<path d="{qr_svg_path(matrix, border)}"/></svg>\n').encode('utf-8')
+
+def render_qr_png(url):
+    """Encode and rasterize one QR code, returning PNG bytes"""
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{QR_SETTINGS['error_correction']}"),
+        box_size=QR_SETTINGS['box_size'],
+        border=QR_SETTINGS['border'],
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color='black', back_color='white')
+    buffer = io.BytesIO()
+    img.save(buffer)
+    return buffer.getvalue()
+
+QR_RENDERERS = {'png': render_qr_png, 'svg': render_qr_svg}
+
+def write_atomic(path, data):
+    """Write bytes through a temporary file so readers never see half a file"""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+def publish_file(source, target, product_id=None):
+    """Copy a cached file into docs/ and record it in the build report"""
+    started = time.perf_counter()
+    copy_if_changed(source, target)
+    _build_report.record_file(target, 0.0, time.perf_counter() - started, os.path.getsize(target), product_id)
+
+def copy_if_changed(source, target):
+    """Copy a file unless the target already has the same bytes"""
+    if os.path.exists(target) and os.path.getsize(target) == os.path.getsize(source):
+        with open(source, 'rb') as a, open(target, 'rb') as b:
+            if a.read() == b.read():
+                return
+    shutil.copyfile(source, target)
+
+# OFFLINE SUPPORT
+def create_service_worker(products, folder, build):
+    """Write sw.js and its precache manifest from the files now in docs/
+
+    Runs after the post-processing, so every revision is the hash of the
+    exact bytes that will be served. The version changes with any
+    precached file, which makes browsers install the new worker; files
+    whose revision did not change are not downloaded again.
+    """
+    paths = [path for path in OFFLINE_SETTINGS['core_pages'] + [_asset_names['styles.css']]
+             if path in build.outputs]
+    for product in products[:OFFLINE_SETTINGS['precache_qr_codes']]:
+        paths.extend(filename for filename, url, full_url in qr_codes_for(product) if filename in build.outputs)
+
+    precache = {}
+    for path in paths:
+        with open(os.path.join(folder, path), 'rb') as f:
+            precache[path] = hashlib.sha256(f.read()).hexdigest()[:12]
+    version = hash_text(json.dumps(precache, sort_keys=True))[:12]
+
+    manifest = {'version': version, 'entries': [{'url': path, 'revision': revision}
+                                                for path, revision in precache.items()]}
+    write_json_output(build, folder, OFFLINE_SETTINGS['manifest'], manifest)
+    script = get_template('service_worker').render(
+        version=version,
+        precache=json.dumps(precache, separators=(',', ':')),
+        page_cache_entries=OFFLINE_SETTINGS['page_cache_entries'],
+        image_cache_entries=OFFLINE_SETTINGS['image_cache_entries'],
+        opaque_image_cache_entries=OFFLINE_SETTINGS['opaque_image_cache_entries'],
+        network_timeout=OFFLINE_SETTINGS['network_timeout']
+    )
+    if build.is_stale(OFFLINE_SETTINGS['service_worker'], script):
+        write_output(folder, OFFLINE_SETTINGS['service_worker'], script)
+    _build_report.log(f"📶 Created: {OFFLINE_SETTINGS['service_worker']} precaching {len(precache)} files (version {version})")
+
+# PRINT SHEETS
+def create_print_sheets(products, folder=None, cache_folder=QR_CACHE_FOLDER, workers=None):
+    """Lay out the QR codes of all products on printable label sheets
+
+    Writes qr-labels.pdf (every page) and/or one qr-sheet-<n>.svg per page,
+    as set in PRINT_SHEET_SETTINGS. Codes are drawn as vector paths from
+    their module matrix, which is cached next to the QR images, so no
+    image is rasterized and a rerun only encodes new URLs.
+    """
+    settings = PRINT_SHEET_SETTINGS
+    folder = folder or settings['folder']
+    os.makedirs(folder, exist_ok=True)
+    os.makedirs(cache_folder, exist_ok=True)
+
+    labels = []
+    for row in iter_products(products):
+        for filename, url, full_url in qr_codes_for(row):
+            labels.append((url, row['product_name'], row['price']))
+    matrices = load_qr_matrices([url for url, name, price in labels], cache_folder, workers)
+
+    per_page = settings['columns'] * settings['rows']
+    pages = [[(matrices[url], name, price) for url, name, price in chunk]
+             for chunk in chunk_list(labels, per_page)]
+    layout = label_layout(settings)
+
+    written = []
+    if 'pdf' in settings['formats']:
+        path = os.path.join(folder, 'qr-labels.pdf')
+        write_pdf(path, [render_sheet_pdf(page, layout) for page in pages],
+                  settings['page_width'], settings['page_height'])
+        written.append(path)
+    if 'svg' in settings['formats']:
+        for number, page in enumerate(pages, 1):
+            path = os.path.join(folder, f"qr-sheet-{number:02d}.svg")
+            write_atomic(path, render_sheet_svg(page, layout).encode('utf-8'))
+            written.append(path)
+    for path in written:
+        _build_report.record_file(path, 0.0, 0.0, os.path.getsize(path))
+    _build_report.log(f"🖨️ Created: {len(labels)} labels on {len(pages)} sheets in '{folder}'")
+    return written
+
+def load_qr_matrices(urls, cache_folder=QR_CACHE_FOLDER, workers=None):
+    """Module matrix of every url, encoding only those missing from the cache"""
+    matrices = {}
+    missing = []
+    for url in dict.fromkeys(urls):
+        cached = os.path.join(cache_folder, qr_cache_key(url) + '.matrix')
+        try:
+            with open(cached, encoding='ascii') as f:
+                matrices[url] = f.read().split()
+        except OSError:
+            missing.append(url)
+    for url, matrix in zip(missing, map_in_pool(qr_matrix, missing, workers)):
+        write_atomic(os.path.join(cache_folder, qr_cache_key(url) + '.matrix'), '\n'.join(matrix).encode('ascii'))
+        matrices[url] = matrix
+    _build_report.count('qr_matrix_cache_hits', len(matrices) - len(missing))
+    _build_report.count('qr_matrix_cache_misses', len(missing))
+    return matrices
+
+def label_layout(settings):
+    """Cell and QR code sizes of one label, in millimetres"""
+    cell_width = (settings['page_width'] - 2 * settings['margin']) / settings['columns']
+    cell_height = (settings['page_height'] - 2 * settings['margin']) / settings['rows']
+    text_height = 2.6 * settings['font_size']
+    qr_size = min(cell_width, cell_height - text_height) - 2 * settings['padding']
+    return {
+        'cell_width': cell_width,
+        'cell_height': cell_height,
+        'qr_size': qr_size,
+        'font_size': settings['font_size'],
+        'max_chars': int(qr_size / (settings['font_size'] * 0.55)),
+        'settings': settings
+    }
+
+def iter_labels(page, layout):
+    """(matrix, name, price, x, y, module) of each label on a page, in mm"""
+    settings = layout['settings']
+    for position, (matrix, name, price) in enumerate(page):
+        column, row = position % settings['columns'], position // settings['columns']
+        x = settings['margin'] + column * layout['cell_width'] + (layout['cell_width'] - layout['qr_size']) / 2
+        y = settings['margin'] + row * layout['cell_height'] + settings['padding']
+        module = layout['qr_size'] / (len(matrix) + 2 * QR_SETTINGS['border'])
+        if len(name) > layout['max_chars']:
+            name = name[:layout['max_chars'] - 1] + '…'
+        yield matrix, name, price, x, y, module
+
+def render_sheet_svg(page, layout):
+    """One sheet of labels as an SVG document in millimetres"""
+    settings = layout['settings']
+    width, height = settings['page_width'], settings['page_height']
+    border = QR_SETTINGS['border']
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}mm" height="{height}mm" '
+             f'viewBox="0 0 {width} {height}" font-family="Helvetica, Arial, sans-serif" '
+             f'font-size="{layout["font_size"]}">']
+    for matrix, name, price, x, y, module in iter_labels(page, layout):
+        text_x = x + border * module
+        text_y = y + layout['qr_size'] + layout['font_size']
+        parts.append(f'<path transform="translate({x:.2f} {y:.2f}) scale({module:.4f})" '
+                     f'shape-rendering="crispEdges" d="{qr_svg_path(matrix, border)}"/>'
+                     f'<text x="{text_x:.2f}" y="{text_y:.2f}">{html.escape(name)}</text>'
+                     f'<text x="{text_x:.2f}" y="{text_y + layout["font_size"] * 1.2:.2f}" '
+                     f'font-weight="bold">{html.escape(price)}</text>')
+    parts.append('</svg>\n')
+    return ''.join(parts)
+
+def render_sheet_pdf(page, layout):
+    """Content stream of one sheet of labels, drawn in millimetres from the top left"""
+    settings = layout['settings']
+    scale = 72 / 25.4
+    border = QR_SETTINGS['border']
+    parts = [f"{scale:.5f} 0 0 {-scale:.5f} 0 {settings['page_height'] * scale:.2f} cm 0 g\n"]
+    for matrix, name, price, x, y, module in iter_labels(page, layout):
+        text_x = x + border * module
+        text_y = y + layout['qr_size'] + layout['font_size']
+        parts.append(f"q {module:.4f} 0 0 {module:.4f} {x:.2f} {y:.2f} cm\n")
+        parts.append(''.join(f"{column + border} {row + border} {length} 1 re\n" for column, row, length in qr_runs(matrix)))
+        parts.append("f Q\n")
+        parts.append(f"BT /F1 {layout['font_size']} Tf 1 0 0 -1 {text_x:.2f} {text_y:.2f} Tm ({pdf_text(name)}) Tj ET\n")
+        parts.append(f"BT /F1 {layout['font_size']} Tf 1 0 0 -1 {text_x:.2f} {text_y + layout['font_size'] * 1.2:.2f} Tm "
+                     f"({pdf_text(price)}) Tj ET\n")
+    return ''.join(parts)
+
+def pdf_text(text):
+    """Text as a WinAnsi PDF string literal body (₦ has no glyph there)"""
+    text = str(text).replace('₦', 'NGN ').encode('cp1252', 'replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def write_pdf(path, pages, width, height):
+    """Write a minimal PDF with one compressed content stream per page
+
+    Text uses the built-in Helvetica font, so nothing is embedded.
+    """
+    scale = 72 / 25.4
+    kids = ' '.join(f"{4 + 2 * number} 0 R" for number in range(len(pages)))
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode('ascii'),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>'
+    ]
+    for number, content in enumerate(pages):
+        stream = zlib.compress(content.encode('latin-1'))
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width * scale:.2f} {height * scale:.2f}] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * number} 0 R >>".encode('ascii'))
+        objects.append(f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode('ascii')
+                       + stream + b'\nendstream')
+
+    pdf = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode('ascii') + body + b'\nendobj\n'
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('ascii')
+    pdf += ''.join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('ascii')
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('ascii')
+    write_atomic(path, bytes(pdf))
+
+# ASSET POST-PROCESSING
+def optimize_outputs(folder, build, settings, workers=None, filenames=None):
+    """Minify the HTML and JS written by this build and precompress text outputs
+
+    Only files rewritten in this build, or missing a sibling, go to the
+    process pool; the .gz/.br siblings of unchanged files are kept and
+    carried into the manifest here. Files under compress_min_bytes are
+    served as they are. filenames limits the pass to some of the outputs.
+    """
+    summary = filenames is None
+    suffixes = [suffix for suffix, compress in precompressors(settings)] if settings['compress'] else []
+    pending = []
+    for filename in list(build.outputs if summary else filenames):
+        path = os.path.join(folder, filename)
+        if not filename.endswith(COMPRESSIBLE_EXTENSIONS) or not os.path.exists(path):
+            continue
+        if filename in build.written:
+            pending.append(filename)
+        elif os.path.getsize(path) >= settings['compress_min_bytes'] and suffixes:
+            if all(os.path.exists(path + suffix) for suffix in suffixes):
+                for suffix in suffixes:
+                    build.outputs[filename + suffix] = build.outputs[filename]
+            else:
+                pending.append(filename)
+    filenames = pending
+    jobs = [(os.path.join(folder, filename), filename in build.written) for filename in filenames]
+    results = map_in_pool(functools.partial(optimize_file, settings=settings), jobs, workers)
+
+    minified = compressed = 0
+    for filename, (minify_seconds, size, siblings, written) in zip(filenames, results):
+        path = os.path.join(folder, filename)
+        if minify_seconds is not None:
+            _build_report.record_file(path, 0.0, minify_seconds, size)
+            minified += 1
+        for suffix in siblings:
+            build.outputs[filename + suffix] = build.outputs[filename]
+        for suffix, sibling_size, seconds in written:
+            _build_report.record_file(path + suffix, 0.0, seconds, sibling_size)
+            compressed += 1
+    _build_report.count('pages_minified', minified)
+    _build_report.count('precompressed_files', compressed)
+    if summary:
+        _build_report.log(f"🗜️ Optimized: {minified} pages minified, {compressed} precompressed files")
+
+def optimize_file(job, settings):
+    """Minify and precompress one output (called in a worker process)
+
+    job is (path, written in this build). Returns (seconds spent
+    minifying or None, size of the file, suffixes of the precompressed
+    siblings it has, (suffix, size, seconds) of the siblings written now).
+    """
+    path, written = job
+    minify_seconds = None
+    minifier = {'.html': minify_html, '.js': minify_js}.get(os.path.splitext(path)[1])
+    if written and settings['minify'] and minifier:
+        started = time.perf_counter()
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(minifier(content))
+        minify_seconds = time.perf_counter() - started
+
+    size = os.path.getsize(path)
+    if not settings['compress'] or size < settings['compress_min_bytes']:
+        return minify_seconds, size, [], []
+    siblings = []
+    compressed = []
+    data = None
+    for suffix, compress in precompressors(settings):
+        siblings.append(suffix)
+        if written or not os.path.exists(path + suffix):
+            started = time.perf_counter()
+            if data is None:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            compressed_data = compress(data)
+            write_atomic(path + suffix, compressed_data)
+            compressed.append((suffix, len(compressed_data), time.perf_counter() - started))
+    return minify_seconds, size, siblings, compressed
+
+def precompressors(settings):
+    """(suffix, function) pairs for the precompressed siblings to write"""
+    yield '.gz', lambda data: gzip.compress(data, compresslevel=settings['gzip_level'], mtime=0)
+    if brotli is not None:
+        yield '.br', lambda data: brotli.compress(data, quality=settings['brotli_quality'])
+
+HTML_RAW_BLOCK = re.compile(r'<(script|style|pre|textarea)\b.*?</\1>', re.S | re.I)
+
+def minify_html(html_content):
+    """Collapse whitespace and drop comments outside script/style/pre blocks"""
+    chunks = []
+    position = 0
+    for match in HTML_RAW_BLOCK.finditer(html_content):
+        chunks.append(minify_html_text(html_content[position:match.start()]))
+        block = match.group(0)
+        tag = match.group(1).lower()
+        if tag == 'script':
+            block = '\n'.join(line.strip() for line in block.splitlines() if line.strip())
+        elif tag == 'style':
+            block = minify_css(block)
+        chunks.append(block)
+        position = match.end()
+    chunks.append(minify_html_text(html_content[position:]))
+    return ''.join(chunks).strip()
+
+def minify_html_text(text):
+    text = re.sub(r'<!--(?!\[if).*?-->', '', text, flags=re.S)
+    return re.sub(r'\s+', ' ', text)
+
+def minify_js(script):
+    """Drop indentation, blank lines and whole-line // comments"""
+    lines = (line.strip() for line in script.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//')) + '\n'
+
+def minify_css(css_content):
+    """Strip comments and whitespace that CSS does not need"""
+    css_content = re.sub(r'/\*.*?\*/', '', css_content, flags=re.S)
+    css_content = re.sub(r'\s+', ' ', css_content)
+    css_content = re.sub(r'\s*([{};,>])\s*', r'\1', css_content)
+    css_content = re.sub(r':\s+', ':', css_content)
+    return css_content.replace(';}', '}').strip()
+
+# CRITICAL CSS
+# A page keeps the stylesheet rules whose selectors only name classes, ids
+# and tags found in its markup or in its inline scripts (which create the
+# search results). Combinators and pseudo-classes are not evaluated, so a
+# kept rule may not apply, but a rule the page can use is never dropped.
+CSS_SELECTOR_PART = re.compile(r'([.#]?)(-?[_a-zA-Z][\w-]*)')
+CSS_UNCHECKED_SELECTOR_PART = re.compile(r'::?[\w-]+(?:\([^)]*\))?|\[[^\]]*\]')
+HTML_TAG_NAME = re.compile(r'<([a-zA-Z][\w-]*)')
+HTML_CLASS_OR_ID = re.compile(r'\s(class|id)=["\']([^"\']*)["\']')
+HTML_SCRIPT = re.compile(r'<script(?![^>]*\btype=["\']?application/(?:ld\+)?json)[^>]*>(.*?)</script>', re.S | re.I)
+SCRIPT_WORD = re.compile(r'[\w-]+')
+
+class CriticalCss:
+    """The rules of one stylesheet, selected per page
+
+    Selections are cached by the page's set of tags, classes and ids, so
+    the thousands of product pages rendered from one template are matched
+    against the stylesheet once.
+    """
+
+    def __init__(self, css_content):
+        self.rules = parse_css_rules(minify_css(css_content))
+        self.selections = {}
+
+    def for_page(self, html_content):
+        features = page_css_features(html_content)
+        css = self.selections.get(features)
+        if css is None:
+            css = self.selections[features] = self.select(features)
+        return css
+
+    def select(self, features):
+        """Minified CSS of the rules a page with these features can use"""
+        chunks = []
+        open_block = None
+        for block, selectors, body in self.rules:
+            if selectors is None:
+                text = body
+            else:
+                used = [selector for selector, required in selectors if required <= features]
+                if not used:
+                    continue
+                text = f"{','.join(used)}{{{body}}}"
+            if block != open_block:
+                if open_block:
+                    chunks.append('}')
+                if block:
+                    chunks.append(block + '{')
+                open_block = block
+            chunks.append(text)
+        if open_block:
+            chunks.append('}')
+        return ''.join(chunks)
+
+def parse_css_rules(css_content):
+    """(block, selectors, declarations) for every rule of minified CSS
+
+    block is the enclosing @media/@supports prelude or None, selectors are
+    (selector, required features) pairs. Other at-rules (@font-face,
+    @keyframes...) have selectors None and are always kept whole.
+    """
+    rules = []
+    block = None
+    position = 0
+    while position < len(css_content):
+        if css_content[position] == '}':
+            block = None
+            position += 1
+            continue
+        brace = css_content.find('{', position)
+        statement = css_content.find(';', position)
+        if brace < 0:
+            break
+        prelude = css_content[position:brace]
+        if prelude.startswith('@') and 0 <= statement < brace:
+            rules.append((block, None, css_content[position:statement + 1]))
+            position = statement + 1
+        elif prelude.startswith(('@media', '@supports')):
+            block = prelude
+            position = brace + 1
+        elif prelude.startswith('@'):
+            end = css_block_end(css_content, brace)
+            rules.append((block, None, css_content[position:end + 1]))
+            position = end + 1
+        else:
+            end = css_content.index('}', brace)
+            selectors = [(selector, selector_requirements(selector)) for selector in prelude.split(',')]
+            rules.append((block, selectors, css_content[brace + 1:end]))
+            position = end + 1
+    return rules
+
+def css_block_end(css_content, brace):
+    """Index of the brace closing the block opened at brace"""
+    depth = 0
+    for index in range(brace, len(css_content)):
+        if css_content[index] == '{':
+            depth += 1
+        elif css_content[index] == '}':
+            depth -= 1
+            if not depth:
+                return index
+    raise ValueError("Unbalanced braces in stylesheet")
+
+def selector_requirements(selector):
+    """The tags, .classes and #ids a selector names, e.g. {'.nav-links', 'a'}"""
+    selector = CSS_UNCHECKED_SELECTOR_PART.sub(' ', selector)
+    return frozenset(prefix + name if prefix else name.lower()
+                     for prefix, name in CSS_SELECTOR_PART.findall(selector))
+
+def page_css_features(html_content):
+    """The tags, .classes and #ids a page's markup and scripts can produce"""
+    features = {tag.lower() for tag in HTML_TAG_NAME.findall(html_content)}
+    for attribute, value in HTML_CLASS_OR_ID.findall(html_content):
+        prefix = '.' if attribute == 'class' else '#'
+        features.update(prefix + name for name in value.split())
+    for script in HTML_SCRIPT.findall(html_content):
+        for word in set(SCRIPT_WORD.findall(script)):
+            features.update((word.lower(), '.' + word, '#' + word))
+    return frozenset(features)
+
+def inline_critical_css(folder, build, css_content, full_stylesheet='async'):
+    """Inline the rules each page written in this build uses into its <head>
+
+    The blocking stylesheet link is replaced by a <style> block. With
+    full_stylesheet 'async' the whole stylesheet is still fetched with a
+    preload that applies once it arrives (a <noscript> link without
+    JavaScript); with 'none' it is not loaded by the pages at all.
+    """
+    stylesheet = _asset_names['styles.css']
+    link = f'<link rel="stylesheet" href="{stylesheet}">'
+    loader = ''
+    if full_stylesheet == 'async':
+        loader = (f'<link rel="preload" href="{stylesheet}" as="style" '
+                  f'onload="this.onload=null;this.rel=\'stylesheet\'"><noscript>{link}</noscript>')
+    critical = CriticalCss(css_content)
+    pages = inlined_bytes = 0
+    for filename in sorted(build.written):
+        if not filename.endswith('.html'):
+            continue
+        path = os.path.join(folder, filename)
+        with open(path, encoding='utf-8') as f:
+            html_content = f.read()
+        if link not in html_content:
+            continue
+        started = time.perf_counter()
+        css = critical.for_page(html_content)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html_content.replace(link, f'<style>{css}</style>{loader}', 1))
+        _build_report.record_file(path, 0.0, time.perf_counter() - started, os.path.getsize(path))
+        pages += 1
+        inlined_bytes += len(css)
+
+    _build_report.count('critical_css_pages', pages)
+    _build_report.count('critical_css_selections', len(critical.selections))
+    if pages:
+        share = inlined_bytes / pages / max(1, len(minify_css(css_content)))
+        _build_report.log(f"🎨 Inlined critical CSS: {pages} pages, {len(critical.selections)} distinct rule sets, "
+                          f"{share:.0%} of the stylesheet per page on average")
+
+# PRODUCT IMAGES
+_image_variants = {}
+
+def create_images(products, folder, build, workers=None):
+    """Download product photos once and publish resized WebP/JPEG variants
+
+    Sources are cached by URL and revalidated with their ETag at most once
+    per revalidate_after seconds. Variants are named after the content hash
+    of the source, so they are only resized again when the photo changes.
+    """
+    if Image is None:
+        _build_report.log("⚠️ Pillow is not installed, product images stay hotlinked")
+        return
+
+    urls, entries, resized = cache_images(products, workers)
+    published = 0
+    for url, entry in zip(urls, entries):
+        if not entry or not entry.get('variants'):
+            continue
+        _image_variants[url] = {'content': entry['content'], 'variants': entry['variants']}
+        for filename in image_variant_files(entry['content'], entry['variants']):
+            target = f"{IMAGE_SETTINGS['output_folder']}/{filename}"
+            if build.is_stale(target, filename):
+                os.makedirs(os.path.join(folder, IMAGE_SETTINGS['output_folder']), exist_ok=True)
+                publish_file(os.path.join(IMAGE_SETTINGS['cache_folder'], 'variants', filename),
+                             os.path.join(folder, target))
+                published += 1
+
+    photos = sum(1 for entry in entries if entry and entry.get('variants'))
+    _build_report.count('image_files_published', published)
+    _build_report.log(f"🖼️ Created: images for {photos} photos ({resized} resized, {published} files published)")
+
+def cache_images(products, workers=None):
+    """Fetch and resize the photos of products into the image cache
+
+    Returns the photo URLs, their cache entries (None when a photo could
+    not be fetched) and how many sources were resized.
+    """
+    cache_folder = IMAGE_SETTINGS['cache_folder']
+    os.makedirs(os.path.join(cache_folder, 'sources'), exist_ok=True)
+    os.makedirs(os.path.join(cache_folder, 'variants'), exist_ok=True)
+    index = load_image_index()
+    urls = sorted({str(product['image_url']) for product in products
+                   if str(product['image_url']).startswith(('http://', 'https://'))})
+
+    with ThreadPoolExecutor(max_workers=IMAGE_SETTINGS['fetch_workers']) as pool:
+        entries = list(pool.map(fetch_image, urls, [index.get(url) for url in urls]))
+
+    # Only the settings that change the resized files invalidate them
+    settings_hash = hash_text(json.dumps({key: IMAGE_SETTINGS[key] for key in ('variants', 'webp_quality', 'jpeg_quality')},
+                                         sort_keys=True))
+    jobs = {}
+    for url, entry in zip(urls, entries):
+        if entry is None:
+            _build_report.count('image_fetch_failures')
+            _build_report.log(f"⚠️ Could not fetch {url}, keeping the remote image")
+            continue
+        index[url] = entry
+        if entry.get('settings') != settings_hash:
+            jobs.setdefault(entry['content'], []).append(entry)
+
+    contents = list(jobs)
+    workers = workers or os.cpu_count() or 1
+    if len(contents) >= QR_PARALLEL_THRESHOLD and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(resize_image, contents, chunksize=max(1, len(contents) // (workers * 4))))
+    else:
+        results = [resize_image(content) for content in contents]
+    for content, variants in zip(contents, results):
+        for entry in jobs[content]:
+            entry['variants'] = variants
+            entry['settings'] = settings_hash if variants else None
+
+    save_image_index(index)
+    _build_report.count('images_resized', len(contents))
+    return urls, entries, len(contents)
+
+def fetch_image(url, entry=None):
+    """Download one photo into the source cache, returning its cache entry
+
+    A cached copy is reused as-is while fresh, and revalidated with
+    If-None-Match afterwards. On network errors the stale entry is kept.
+    """
+    now = time.time()
+    if entry and os.path.exists(image_source_path(entry['content'])):
+        if now - entry.get('checked', 0) < IMAGE_SETTINGS['revalidate_after']:
+            return entry
+    else:
+        entry = None
+
+    request = urllib.request.Request(url, headers={'User-Agent': 'product-qr-system'})
+    if entry and entry.get('etag'):
+        request.add_header('If-None-Match', entry['etag'])
+    try:
+        with urllib.request.urlopen(request, timeout=IMAGE_SETTINGS['timeout']) as response:
+            data = response.read()
+            etag = response.headers.get('ETag')
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and entry:
+            return {**entry, 'checked': now}
+        return entry
+    except (urllib.error.URLError, OSError, ValueError):
+        return entry
+
+    content = hashlib.sha256(data).hexdigest()[:16]
+    if entry and entry['content'] == content:
+        return {**entry, 'etag': etag, 'checked': now}
+    write_atomic(image_source_path(content), data)
+    return {'etag': etag, 'content': content, 'checked': now}
+
+def resize_image(content):
+    """Write every configured variant of a cached photo as WebP and JPEG
+
+    Returns {variant: [[width, height], ...]}, or None if the file is not
+    an image Pillow can read.
+    """
+    variants_folder = os.path.join(IMAGE_SETTINGS['cache_folder'], 'variants')
+    try:
+        with Image.open(image_source_path(content)) as source:
+            source = ImageOps.exif_transpose(source)
+            if source.mode in ('RGBA', 'LA', 'P'):
+                source = source.convert('RGBA')
+                background = Image.new('RGB', source.size, 'white')
+                background.paste(source, mask=source.split()[-1])
+                source = background
+            else:
+                source = source.convert('RGB')
+
+            variants = {}
+            for name, variant in IMAGE_SETTINGS['variants'].items():
+                sizes = []
+                for width in variant['widths']:
+                    width = min(width, source.width, source.height if variant['square'] else source.width)
+                    if variant['square']:
+                        image = ImageOps.fit(source, (width, width), Image.LANCZOS)
+                    else:
+                        image = source.resize((width, max(1, round(source.height * width / source.width))), Image.LANCZOS)
+                    if [image.width, image.height] in sizes:
+                        continue
+                    base = os.path.join(variants_folder, f"{content}-{name}-{image.width}")
+                    image.save(base + '.webp', 'WEBP', quality=IMAGE_SETTINGS['webp_quality'], method=6)
+                    image.save(base + '.jpg', 'JPEG', quality=IMAGE_SETTINGS['jpeg_quality'], optimize=True, progressive=True)
+                    sizes.append([image.width, image.height])
+                variants[name] = sizes
+            return variants
+    except (OSError, ValueError):
+        return None
+
+def render_picture(product, variant, css_class=None, lazy=True):
+    """<picture> for a product photo, or the plain remote <img> without local variants"""
+    url = product['image_url']
+    class_attr = f' class="{css_class}"' if css_class else ''
+    alt = html.escape(product['product_name'], quote=True)
+    image = _image_variants.get(url)
+    if not image:
+        return f'<img src="{html.escape(url, quote=True)}" alt="{alt}"{class_attr}>'
+
+    sizes = image['variants'][variant]
+    base = f"{IMAGE_SETTINGS['output_folder']}/{image['content']}-{variant}"
+    webp = ', '.join(f"{base}-{width}.webp {width}w" for width, height in sizes)
+    jpeg = ', '.join(f"{base}-{width}.jpg {width}w" for width, height in sizes)
+    width, height = sizes[0]
+    size_hint = IMAGE_SETTINGS['variants'][variant]['sizes']
+    loading = ' loading="lazy"' if lazy else ''
+    return (f'<picture><source type="image/webp" srcset="{webp}" sizes="{size_hint}">'
+            f'<img src="{base}-{width}.jpg" srcset="{jpeg}" sizes="{size_hint}" width="{width}" height="{height}"'
+            f'{loading} decoding="async" alt="{alt}"{class_attr}></picture>')
+
+def image_signature(product):
+    """What a page renders for a product photo, for the build manifest"""
+    return json.dumps(_image_variants.get(product['image_url']), sort_keys=True)
+
+def image_variant_files(content, variants):
+    for name, sizes in variants.items():
+        for width, height in sizes:
+            yield f"{content}-{name}-{width}.webp"
+            yield f"{content}-{name}-{width}.jpg"
+
+def image_source_path(content):
+    return os.path.join(IMAGE_SETTINGS['cache_folder'], 'sources', content)
+
+def load_image_index():
+    try:
+        with open(os.path.join(IMAGE_SETTINGS['cache_folder'], 'index.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_image_index(index):
+    data = json.dumps(index, indent=2, sort_keys=True).encode('utf-8')
+    write_atomic(os.path.join(IMAGE_SETTINGS['cache_folder'], 'index.json'), data)
+
+# LINK CHECKS
+class HostConnections:
+    """Keep-alive HTTP/1.1 connections to one host, at most limit in use at a time"""
+
+    def __init__(self, scheme, host, port, limit, ssl_context):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.slots = asyncio.Semaphore(limit)
+        self.ssl_context = ssl_context if scheme == 'https' else None
+        self.idle = []
+
+    async def request(self, method, target, timeout):
+        """(status, headers) of one request, on an idle connection when there is one"""
+        async with self.slots:
+            while True:
+                connection = self.idle.pop() if self.idle else None
+                reader, writer = connection or await asyncio.wait_for(asyncio.open_connection(
+                    self.host, self.port, ssl=self.ssl_context, limit=2 ** 18,
+                    server_hostname=self.host if self.ssl_context else None), timeout)
+                try:
+                    status, headers, keep_alive = await asyncio.wait_for(
+                        http_exchange(reader, writer, self.host_header(), method, target), timeout)
+                except Exception as e:
+                    writer.close()
+                    # The server may have closed a connection while it sat idle
+                    if connection and isinstance(e, (ConnectionError, asyncio.IncompleteReadError)):
+                        continue
+                    raise
+                if keep_alive:
+                    self.idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status, headers
+
+    def host_header(self):
+        default_port = 443 if self.scheme == 'https' else 80
+        return self.host if self.port == default_port else f"{self.host}:{self.port}"
+
+    def close(self):
+        for reader, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+async def http_exchange(reader, writer, host, method, target):
+    """Send one request and read the response off the connection
+
+    Returns (status, headers, keep_alive). Bodies are only read when they
+    are small and delimited by Content-Length; otherwise the connection is
+    not reused.
+    """
+    request = f"{method} {target} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: product-qr-system\r\nAccept: */*\r\n"
+    if method == 'GET':
+        request += 'Range: bytes=0-0\r\n'
+    writer.write((request + '\r\n').encode('latin-1'))
+    await writer.drain()
+    head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+    version, status = head[0].split(' ', 2)[:2]
+    headers = {}
+    for line in head[1:]:
+        name, _, value = line.partition(':')
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    status = int(status)
+    keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+    if method != 'HEAD' and status not in (204, 304) and status >= 200:
+        length = headers.get('content-length', '')
+        if length.isdigit() and int(length) <= 2 ** 16 and 'transfer-encoding' not in headers:
+            await reader.readexactly(int(length))
+        else:
+            keep_alive = False
+    return status, headers, keep_alive
+
+class LinkChecker:
+    """Check many URLs at once over pooled per-host connections"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.ssl_context = ssl.create_default_context()
+        self.hosts = {}
+
+    async def check(self, urls):
+        """{url: result} for every URL, see probe"""
+        slots = asyncio.Semaphore(self.settings['connections'])
+
+        async def probe(url):
+            async with slots:
+                return url, await self.probe(url)
+        try:
+            return dict(await asyncio.gather(*[probe(url) for url in urls]))
+        finally:
+            for connections in self.hosts.values():
+                connections.close()
+
+    async def probe(self, url):
+        """{'status': final status} after redirects, or {'status': None, 'error': ...}
+
+        HEAD is tried first; hosts that refuse it get a one-byte ranged GET.
+        """
+        method = 'HEAD'
+        for attempt in range(self.settings['max_redirects'] + 2):
+            parts = urllib.parse.urlsplit(url)
+            target = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+            try:
+                status, headers = await self.connections(parts).request(method, target, self.settings['timeout'])
+            except asyncio.TimeoutError:
+                return {'status': None, 'error': f"no response in {self.settings['timeout']}s"}
+            except (OSError, EOFError, ValueError, asyncio.LimitOverrunError) as e:
+                return {'status': None, 'error': str(e) or type(e).__name__}
+            if status in (405, 501) and method == 'HEAD':
+                method = 'GET'
+            elif status in (301, 302, 303, 307, 308) and 'location' in headers:
+                url = urllib.parse.urljoin(url, headers['location'])
+            else:
+                return {'status': status}
+        return {'status': None, 'error': 'too many redirects'}
+
+    def connections(self, parts):
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        if key not in self.hosts:
+            self.hosts[key] = HostConnections(parts.scheme, parts.hostname, port,
+                                              self.settings['connections_per_host'], self.ssl_context)
+        return self.hosts[key]
+
+def external_links(products):
+    """{url to check: product ids linking to it} for the external links of the site
+
+    The WhatsApp and Instagram links are on every page and are listed with
+    no products; order links only differ from them in the message.
+    """
+    links = {}
+
+    def add(url, product_id=None):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            return
+        if parts.hostname in LINK_CHECK_SETTINGS['strip_query_hosts']:
+            url = urllib.parse.urlunsplit(parts._replace(query='', fragment=''))
+        product_ids = links.setdefault(url, {})
+        if product_id is not None:
+            product_ids[product_id] = True
+
+    add(whatsapp_link())
+    add(f"https://instagram.com/{BUSINESS_INFO['instagram_handle']}")
+    for product in products:
+        add(product.image_url, product.product_id)
+        add(order_link(product))
+    return {url: list(product_ids) for url, product_ids in links.items()}
+
+def link_state(result):
+    if result.get('status') is None:
+        return 'unreachable'
+    if result['status'] == 429:
+        return 'rate limited'
+    return 'ok' if result['status'] < 400 else 'broken'
+
+def check_external_links(products, settings=None):
+    """Check the external links of the site and report the failing ones
+
+    Results come from the link cache while fresh; the rest are probed
+    concurrently. Returns {url: result}.
+    """
+    settings = {**LINK_CHECK_SETTINGS, **(settings or {})}
+    links = external_links(products)
+    try:
+        with open(settings['cache_file'], encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    now = time.time()
+
+    def fresh(result):
+        ttl = settings['ttl'] if link_state(result) == 'ok' else settings['failure_ttl']
+        return now - result['checked'] < ttl
+
+    cache = {url: result for url, result in cache.items() if fresh(result)}
+    stale = [url for url in links if url not in cache]
+    if stale:
+        for url, result in asyncio.run(LinkChecker(settings).check(stale)).items():
+            cache[url] = {**result, 'checked': now}
+        os.makedirs(os.path.dirname(settings['cache_file']) or '.', exist_ok=True)
+        write_atomic(settings['cache_file'], json.dumps(cache, indent=2, sort_keys=True).encode('utf-8'))
+
+    results = {url: cache[url] for url in links}
+    states = {}
+    failing = []
+    for url, result in results.items():
+        state = link_state(result)
+        states[state] = states.get(state, 0) + 1
+        if state != 'ok':
+            failing.append(url)
+            _build_report.record('links', url=url, state=state, status=result.get('status'),
+                                 error=result.get('error'), products=links[url])
+    _build_report.count('links_probed', len(stale))
+    _build_report.count('links_failing', len(failing))
+    _build_report.log(f"🔗 Checked {len(results)} links ({len(stale)} probed, {len(results) - len(stale)} cached): "
+                      + ', '.join(f"{count} {state}" for state, count in sorted(states.items())))
+    for url in failing[:10]:
+        result = results[url]
+        used_by = f" (products {', '.join(links[url][:5])}{'...' if len(links[url]) > 5 else ''})" if links[url] else ''
+        _build_report.log(f"⚠️ {link_state(result).capitalize()} link: {url} [{result['status'] or result['error']}]{used_by}")
+    if len(failing) > 10:
+        _build_report.log(f"⚠️ ...and {len(failing) - 10} more, see {BUILD_REPORT_FILE}")
+    return results
+
+# MULTI-STORE BUILDS
+# stores.json lists the storefronts built by --stores, e.g.
+#   [{"name": "ikoyi", "site_url": "https://example.github.io/ikoyi/",
+#     "business_info": {"address": "...", "whatsapp_number": "..."}}]
+# business_info overrides BUSINESS_INFO; catalog and docs_folder default to
+# <name>/products.csv and <name>/docs next to stores.json.
+def load_stores(path=STORES_FILE):
+    """Store configs from a stores file, with their paths resolved"""
+    with open(path, encoding='utf-8') as f:
+        stores = json.load(f)
+    root = os.path.dirname(path)
+    for store in stores:
+        if 'name' not in store:
+            raise ValueError(f"{path}: every store needs a name")
+        store['catalog'] = os.path.join(root, store.get('catalog', os.path.join(store['name'], CATALOG_FILE)))
+        store['docs_folder'] = os.path.join(root, store.get('docs_folder', os.path.join(store['name'], 'docs')))
+        store.setdefault('site_url', SITE_URL)
+        store.setdefault('business_info', {})
+    return stores
+
+@contextlib.contextmanager
+def storefront(store):
+    """Point BUSINESS_INFO and the site URLs at one store while it builds"""
+    global SITE_URL
+    saved = dict(BUSINESS_INFO), SITE_URL, SHORT_LINK_SETTINGS['base_url']
+    BUSINESS_INFO.update(store['business_info'])
+    SITE_URL = store['site_url']
+    SHORT_LINK_SETTINGS['base_url'] = store.get('short_link_base_url', store['site_url'])
+    try:
+        yield store
+    finally:
+        BUSINESS_INFO.clear()
+        BUSINESS_INFO.update(saved[0])
+        SITE_URL, SHORT_LINK_SETTINGS['base_url'] = saved[1], saved[2]
+
+def build_store(store, options):
+    """Build one storefront quietly, returning a summary of its build"""
+    options = dict(options)
+    QR_SETTINGS['format'] = options.pop('qr_format', QR_SETTINGS['format'])
+    report = BuildReport()
+    started = time.perf_counter()
+    try:
+        with storefront(store), contextlib.redirect_stdout(io.StringIO()):
+            create_final_website(catalog_file=store['catalog'], docs_folder=store['docs_folder'],
+                                 report=report, **options)
+    except Exception as e:
+        return {'name': store['name'], 'error': f"{type(e).__name__}: {e}"}
+    if 'products' not in report.summary:
+        return {'name': store['name'], 'error': report.messages[-1].replace('❌ ', '', 1)}
+    return {
+        'name': store['name'],
+        'products': report.summary['products'],
+        'rebuilt': report.counters.get('outputs_rebuilt', 0),
+        'unchanged': report.counters.get('outputs_unchanged', 0),
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+
+def build_stores(stores, jobs=None, **build_options):
+    """Build many storefronts in one warm process tree
+
+    Templates are compiled and every store's photos fetched and resized
+    once up front, then the stores fan out across jobs forked workers
+    that share those caches and the QR cache. Each worker builds its
+    stores one after another with single-process QR and image stages.
+    """
+    print(f"🏬 BUILDING {len(stores)} STOREFRONTS")
+    print("=" * 60)
+    started = time.perf_counter()
+    for name in TEMPLATES:
+        get_template(name)
+    if build_options.get('images', True) and Image is not None:
+        catalog = []
+        for store in stores:
+            with contextlib.suppress(OSError, ValueError):
+                catalog.extend(load_catalog(store['catalog']))
+        cache_images(catalog)
+
+    jobs = min(jobs or os.cpu_count() or 1, len(stores))
+    options = {**build_options, 'qr_format': QR_SETTINGS['format']}
+    if jobs > 1:
+        options['workers'] = 1
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = pool.map(build_store, stores, itertools.repeat(options))
+            results = [print_store_result(result) for result in results]
+    else:
+        results = [print_store_result(build_store(store, options)) for store in stores]
+
+    failed = [result for result in results if 'error' in result]
+    print(f"\n🎉 Built {len(results) - len(failed)} of {len(results)} storefronts "
+          f"in {time.perf_counter() - started:.1f}s with {jobs} workers")
+    return results
+
+def print_store_result(result):
+    if 'error' in result:
+        print(f"❌ {result['name']}: {result['error']}")
+    else:
+        print(f"🏪 {result['name']}: {result['products']} products, {result['rebuilt']} rebuilt, "
+              f"{result['unchanged']} unchanged in {result['seconds']:.2f}s")
+    return result
+
+# WATCH MODE
+# The dev server injects this script into every HTML page it serves; it
+# reloads the page after each rebuild and after the watcher restarts.
+LIVE_RELOAD_PATH = '/__livereload'
+LIVE_RELOAD_SCRIPT = '''<script>
+(function () {
+    var events = new EventSource('/__livereload');
+    var lost = false;
+    events.addEventListener('reload', function () { location.reload(); });
+    events.onerror = function () { lost = true; };
+    events.onopen = function () { if (lost) location.reload(); };
+})();
+</script>'''
+
+class LiveReload:
+    """Build counter that live-reload connections wait on"""
+
+    def __init__(self):
+        self.build = 0
+        self.changed = threading.Condition()
+
+    def notify(self):
+        with self.changed:
+            self.build += 1
+            self.changed.notify_all()
+
+    def wait(self, build, timeout=15):
+        """Wait for a build newer than build, returning the latest build number"""
+        with self.changed:
+            self.changed.wait_for(lambda: self.build != build, timeout)
+            return self.build
+
+# Watch builds have no service worker. A worker registered by an earlier
+# preview of a full build is replaced by this one, which clears its caches,
+# unregisters and reloads the open pages so they come from the dev server.
+UNREGISTER_SERVICE_WORKER = '''self.addEventListener('install', function () { self.skipWaiting(); });
+self.addEventListener('activate', function (event) {
+    event.waitUntil(caches.keys().then(function (names) {
+        return Promise.all(names.map(function (name) { return caches.delete(name); }));
+    }).then(function () {
+        return self.registration.unregister();
+    }).then(function () {
+        return self.clients.matchAll({type: 'window'});
+    }).then(function (clients) {
+        clients.forEach(function (client) { client.navigate(client.url); });
+    }));
+});
+'''
+
+class DevRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serve docs/ without caching and with the live-reload script injected"""
+
+    live_reload = None
+
+    def do_GET(self):
+        if self.path == LIVE_RELOAD_PATH:
+            return self.send_events()
+        if self.path == '/' + OFFLINE_SETTINGS['service_worker']:
+            return self.send_body(UNREGISTER_SERVICE_WORKER.encode('utf-8'), 'text/javascript')
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, 'index.html')
+        elif not os.path.exists(path) and os.path.isfile(path + '.html'):
+            # GitHub Pages serves short links like p/101 from p/101.html
+            path += '.html'
+        if not path.endswith('.html') or not os.path.isfile(path):
+            return super().do_GET()
+
+        with open(path, 'rb') as f:
+            html_content = f.read().decode('utf-8')
+        if '</body>' in html_content:
+            html_content = html_content.replace('</body>', LIVE_RELOAD_SCRIPT + '</body>', 1)
+        else:
+            html_content += LIVE_RELOAD_SCRIPT
+        self.send_body(html_content.encode('utf-8'), 'text/html')
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', f"{content_type}; charset=utf-8")
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_events(self):
+        """Server-sent events: one 'reload' event per finished build"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        build = self.live_reload.build
+        try:
+            while True:
+                latest = self.live_reload.wait(build)
+                if latest == build:
+                    self.wfile.write(b': ping\n\n')
+                else:
+                    build = latest
+                    self.wfile.write(f"event: reload\ndata: {build}\n\n".encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def end_headers(self):
+        self.send_header('Cache-Control', 'no-store')
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_docs(folder, port, live_reload):
+    """Serve folder on localhost:port from a background thread"""
+    handler = type('Handler', (DevRequestHandler,), {'live_reload': live_reload})
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', port), functools.partial(handler, directory=folder))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def read_business_info(script_path):
+    """BUSINESS_INFO as written in the script, and the rest of its source
+
+    Returns (None, source) when the script has no literal BUSINESS_INFO.
+    Raises SyntaxError while the script is half edited.
+    """
+    with open(script_path, encoding='utf-8') as f:
+        source = f.read()
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and [getattr(target, 'id', None) for target in node.targets] == ['BUSINESS_INFO']:
+            lines = source.splitlines(keepends=True)
+            rest = ''.join(lines[:node.lineno - 1] + lines[node.end_lineno:])
+            return ast.literal_eval(node.value), rest
+    return None, source
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def watch_website(port=8000, interval=0.2, **build_options):
+    """Rebuild docs/ whenever products.csv or this script changes
+
+    Runs incremental builds in this process so the compiled templates, the
+    parsed catalog and the image index stay warm, and serves docs/ with
+    live reload. An edit to BUSINESS_INFO is applied in place; any other
+    edit to the script restarts the watcher with the new code. Pages are
+    built without the service worker.
+    """
+    script_path = os.path.abspath(__file__)
+    live_reload = LiveReload()
+    verbose = build_options.pop('verbose', False)
+    # A service worker would answer live reloads from its precache
+    OFFLINE_SETTINGS['enabled'] = False
+
+    def build(products):
+        started = time.perf_counter()
+        try:
+            create_final_website(incremental=True, products=products, report=BuildReport(verbose=verbose),
+                                 **build_options)
+        except Exception as e:
+            print(f"❌ Build failed: {e}")
+            return
+        live_reload.notify()
+        print(f"⚡ Rebuilt in {time.perf_counter() - started:.2f}s")
+
+    products = load_catalog(CATALOG_FILE)
+    catalog_hash = hash_file(CATALOG_FILE)
+    business_info, script_rest = read_business_info(script_path)
+    build(products)
+    server = serve_docs('docs', port, live_reload)
+    print(f"\n👀 Watching {CATALOG_FILE} and {os.path.basename(script_path)}")
+    print(f"🔌 Preview with live reload: http://127.0.0.1:{port}/ (Ctrl+C to stop)")
+
+    signatures = {path: file_signature(path) for path in (CATALOG_FILE, script_path)}
+    try:
+        while True:
+            time.sleep(interval)
+            changed = [path for path in signatures if file_signature(path) != signatures[path]]
+            if not changed:
+                continue
+            # Let editors finish writing before reading the files
+            time.sleep(interval)
+            signatures = {path: file_signature(path) for path in signatures}
+
+            if script_path in changed:
+                try:
+                    new_info, new_rest = read_business_info(script_path)
+                except (SyntaxError, ValueError) as e:
+                    print(f"⚠️ {os.path.basename(script_path)} does not parse yet: {e}")
+                    continue
+                if new_rest != script_rest or new_info is None:
+                    print("🔁 Script changed, restarting the watcher")
+                    server.server_close()
+                    os.execv(sys.executable, [sys.executable] + sys.argv)
+                if new_info != business_info:
+                    business_info = new_info
+                    BUSINESS_INFO.clear()
+                    BUSINESS_INFO.update(new_info)
+                    print("🏪 BUSINESS_INFO changed")
+                    build(products)
+
+            if CATALOG_FILE in changed and hash_file(CATALOG_FILE) != catalog_hash:
+                try:
+                    products = load_catalog(CATALOG_FILE)
+                except (OSError, ValueError, csv.Error) as e:
+                    print(f"⚠️ Could not read {CATALOG_FILE}: {e}")
+                    continue
+                catalog_hash = hash_file(CATALOG_FILE)
+                print(f"🛒 {CATALOG_FILE} changed")
+                build(products)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        server.server_close()
 
 if __name__ == "__main__":
-    create_final_website()
+    parser = argparse.ArgumentParser(description="Generate the product website in docs/")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only rebuild pages whose inputs changed since the last build")
+    parser.add_argument('--index-mode', choices=('single', 'pages', 'shards'), default=INDEX_SETTINGS['mode'],
+                        help="how to split the product list on large catalogs")
+    parser.add_argument('--page-size', type=int, default=INDEX_SETTINGS['page_size'],
+                        help="products on index.html and on each numbered page")
+    parser.add_argument('--shard-size', type=int, default=INDEX_SETTINGS['shard_size'],
+                        help="products per JSON shard in shards mode")
+    parser.add_argument('--no-images', action='store_true',
+                        help="skip downloading and resizing product photos")
+    parser.add_argument('--no-minify', action='store_true', help="keep HTML and CSS as rendered")
+    parser.add_argument('--no-fingerprint', action='store_true', help="write styles.css instead of styles.<hash>.css")
+    parser.add_argument('--no-critical-css', action='store_true',
+                        help="link the full stylesheet instead of inlining the rules each page uses")
+    parser.add_argument('--full-stylesheet', choices=('async', 'none'), default=ASSET_SETTINGS['full_stylesheet'],
+                        help="how pages with critical CSS load the full stylesheet")
+    parser.add_argument('--no-compress', action='store_true', help="skip the precompressed .gz/.br files")
+    parser.add_argument('--profile', action='store_true', help=f"run cProfile and write {BUILD_PROFILE_FILE}")
+    parser.add_argument('--trace-memory', action='store_true', help="record tracemalloc peaks per stage")
+    parser.add_argument('--verbose', action='store_true', help="print every file written")
+    parser.add_argument('--watch', action='store_true',
+                        help="rebuild on every change and serve docs/ with live reload")
+    parser.add_argument('--port', type=int, default=8000, help="port of the --watch preview server")
+    parser.add_argument('--qr-format', choices=sorted(QR_RENDERERS), default=QR_SETTINGS['format'],
+                        help="image format of the per-product QR codes")
+    parser.add_argument('--print-sheets', action='store_true',
+                        help=f"also write printable QR label sheets to {PRINT_SHEET_SETTINGS['folder']}/")
+    parser.add_argument('--stores', metavar='STORES_JSON', nargs='?', const=STORES_FILE,
+                        help=f"build every storefront listed in a stores file (default {STORES_FILE})")
+    parser.add_argument('--jobs', type=int, help="storefronts built in parallel with --stores")
+    parser.add_argument('--check-links', action='store_true',
+                        help="check that product photos and external links still resolve")
+    args = parser.parse_args()
+    QR_SETTINGS['format'] = args.qr_format
+
+    build_options = {
+        'index_settings': {
+            'mode': args.index_mode,
+            'page_size': args.page_size,
+            'shard_size': args.shard_size
+        },
+        'images': not args.no_images,
+        'asset_settings': {
+            'minify': not args.no_minify,
+            'fingerprint': not args.no_fingerprint,
+            'critical_css': not args.no_critical_css,
+            'full_stylesheet': args.full_stylesheet,
+            'compress': not args.no_compress
+        },
+        'print_sheets': args.print_sheets,
+        'check_links': args.check_links
+    }
+    if args.stores:
+        build_stores(load_stores(args.stores), args.jobs, incremental=args.incremental, **build_options)
+    elif args.watch:
+        watch_website(args.port, verbose=args.verbose, **build_options)
+    else:
+        create_final_website(incremental=args.incremental, **build_options,
+                             report=BuildReport(profile=args.profile, trace_memory=args.trace_memory,
+                                                verbose=args.verbose))
     
\ No newline at end of file
@@ -0,0 +1,35 @@
+import http.server
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def local_server():
+    """Start a threaded HTTP/1.1 server for a handler class, returning its base URL"""
+    servers = []
+
+    def start(handler):
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """The generator module, run inside an empty working directory"""
+    import final_website_complete
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(final_website_complete, '_image_variants', {})
+    return final_website_complete
@@ -0,0 +1,81 @@
+import csv
+import json
+import os
+
+import pytest
+
+
+def write_catalog(site, rows):
+    with open(site.CATALOG_FILE, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(site.PRODUCT_COLUMNS)
+        writer.writerows(rows)
+
+
+def fields(products):
+    return [[getattr(product, name) for name in product.__slots__] for product in products]
+
+
+def snapshot_kinds(site):
+    folder = site.CATALOG_SNAPSHOT_FOLDER
+    [name] = os.listdir(folder)
+    with open(os.path.join(folder, name), 'rb') as f:
+        header = json.loads(f.read().split(b'\n')[1])
+    return {column['name']: column['kind'] for column in header['columns']}
+
+
+def load_twice(site):
+    site.start_build_report()
+    parsed = site.load_catalog()
+    report = site.start_build_report()
+    loaded = site.load_catalog()
+    assert report.counters['catalog_snapshot_hits'] == 1
+    return parsed, loaded
+
+
+@pytest.mark.parametrize('product_id', ['SAPH-01', '007', '12345678901234567890'])
+def test_text_ids_round_trip(site, product_id):
+    write_catalog(site, [
+        [product_id, 'Ògbọ̀ cake 🎂', '₦5,000.50', 'Ẹ kú àbọ̀', 'Saph', '', '@saph'],
+        ['2', 'Chin chin', 'Ask for price', '', 'Saph', '', '@saph']
+    ])
+    parsed, loaded = load_twice(site)
+
+    assert snapshot_kinds(site)['product_id'] == 'text'
+    assert fields(loaded) == fields(parsed)
+    assert loaded[0].product_id == product_id and loaded[0].price_kobo == 500050
+    assert loaded[1].price_kobo is None
+
+
+def test_integer_ids_and_oversized_prices(site):
+    write_catalog(site, [
+        ['1', 'Cake', '₦5000', 'A cake', 'Saph', '', '@saph'],
+        ['2', 'Wedding cake', '₦' + '9' * 20, 'A big cake', 'Saph', '', '@saph'],
+        ['3', 'Puff puff', '', '', 'Saph', '', '@saph']
+    ])
+    parsed, loaded = load_twice(site)
+
+    kinds = snapshot_kinds(site)
+    assert kinds['product_id'] == 'int' and kinds['price_kobo'] == 'text'
+    assert fields(loaded) == fields(parsed)
+    assert [product.price_kobo for product in loaded] == [500000, int('9' * 20) * 100, None]
+
+
+def test_changed_csv_is_parsed_again(site):
+    write_catalog(site, [['1', 'Cake', '₦5000', 'A cake', 'Saph', '', '@saph']])
+    load_twice(site)
+
+    write_catalog(site, [['1', 'Cake', '₦6000', 'A cake', 'Saph', '', '@saph']])
+    report = site.start_build_report()
+    [product] = site.load_catalog()
+    assert report.counters['catalog_snapshot_misses'] == 1
+    assert product.price == '₦6000' and product.price_kobo == 600000
+
+
+def test_unwritable_snapshot_does_not_fail(site):
+    write_catalog(site, [['1', 'Cake', '₦5000', 'A cake', 'Saph', '', '@saph']])
+    with open('not-a-folder', 'w') as f:
+        f.write('')
+    site.start_build_report()
+    [product] = site.load_catalog(snapshot_folder=os.path.join('not-a-folder', 'catalog'))
+    assert product.product_id == '1'
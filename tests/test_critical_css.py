@@ -0,0 +1,87 @@
+STYLESHEET = """
+body { margin: 0; }
+.contact-btn { padding: 10px; }
+.contact-btn.instagram { background: #e1306c; }
+.nav-links a:hover { color: red; }
+.search-results li { list-style: none; }
+@import url(fonts.css);
+@font-face { font-family: Brand; src: url(brand.woff2); }
+@media (max-width: 600px) {
+    .contact-btn, .hero { width: 100%; }
+    .gallery { display: none; }
+}
+"""
+
+
+def page(body, script=''):
+    return f'<html><head></head><body>{body}<script>{script}</script></body></html>'
+
+
+def test_parse_css_rules(site):
+    rules = site.parse_css_rules(site.minify_css(STYLESHEET))
+
+    assert [(block, body) for block, selectors, body in rules] == [
+        (None, 'margin:0'),
+        (None, 'padding:10px'),
+        (None, 'background:#e1306c'),
+        (None, 'color:red'),
+        (None, 'list-style:none'),
+        (None, '@import url(fonts.css);'),
+        (None, '@font-face{font-family:Brand;src:url(brand.woff2)}'),
+        ('@media (max-width:600px)', 'width:100%'),
+        ('@media (max-width:600px)', 'display:none')
+    ]
+    media_selectors = rules[7][1]
+    assert media_selectors == [('.contact-btn', frozenset({'.contact-btn'})), ('.hero', frozenset({'.hero'}))]
+    assert rules[5][1] is None and rules[6][1] is None
+
+
+def test_selector_requirements(site):
+    assert site.selector_requirements('.contact-btn.instagram') == {'.contact-btn', '.instagram'}
+    assert site.selector_requirements('.nav-links a:hover') == {'.nav-links', 'a'}
+    assert site.selector_requirements('input[type="search"]::placeholder') == {'input'}
+    assert site.selector_requirements('#search LI') == {'#search', 'li'}
+
+
+def test_compound_selectors_need_every_class(site):
+    critical = site.CriticalCss(STYLESHEET)
+
+    whatsapp = critical.for_page(page('<a class="contact-btn whatsapp">Chat</a>'))
+    assert '.contact-btn{padding:10px}' in whatsapp
+    assert 'instagram' not in whatsapp
+
+    instagram = critical.for_page(page('<a class="contact-btn instagram">Follow</a>'))
+    assert '.contact-btn.instagram{background:#e1306c}' in instagram
+
+
+def test_media_blocks_keep_only_used_rules(site):
+    critical = site.CriticalCss(STYLESHEET)
+
+    css = critical.for_page(page('<a class="contact-btn">Chat</a>'))
+    assert '@media (max-width:600px){.contact-btn{width:100%}}' in css
+    assert '.gallery' not in css and '.hero' not in css
+    assert css.startswith('body{margin:0}')
+    assert '@import url(fonts.css);' in css and '@font-face{' in css
+
+    css = critical.for_page(page('<p>Plain</p>'))
+    assert '@media' not in css
+
+
+def test_classes_created_by_scripts(site):
+    critical = site.CriticalCss(STYLESHEET)
+    results = '<div class="search-results" id="searchResults"></div>'
+
+    assert '.search-results li' not in critical.for_page(page(results))
+    script = "const item = document.createElement('li'); searchResults.appendChild(item);"
+    assert '.search-results li{list-style:none}' in critical.for_page(page(results, script))
+
+    # Classes only added by a script still count
+    css = critical.for_page(page('<ul></ul>', "list.innerHTML = '<li class=\"search-results\">';"))
+    assert '.search-results li{list-style:none}' in css
+
+
+def test_selections_are_cached_per_feature_set(site):
+    critical = site.CriticalCss(STYLESHEET)
+    critical.for_page(page('<a class="contact-btn">One</a>'))
+    critical.for_page(page('<a class="contact-btn">Two</a>'))
+    assert len(critical.selections) == 1
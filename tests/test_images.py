@@ -0,0 +1,124 @@
+import csv
+import http.server
+import io
+import os
+import re
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def photo_bytes(size=(800, 600)):
+    data = io.BytesIO()
+    Image.new('RGB', size, (200, 120, 40)).save(data, 'JPEG')
+    return data.getvalue()
+
+
+class PhotoHandler(http.server.BaseHTTPRequestHandler):
+    """Serves /photo.jpg with an ETag; every other path is a 404"""
+    protocol_version = 'HTTP/1.1'
+    photo = photo_bytes()
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get('If-None-Match')))
+        if self.path != '/photo.jpg':
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header('ETag', '"v1"')
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(self.photo)))
+            self.end_headers()
+            self.wfile.write(self.photo)
+
+
+@pytest.fixture
+def photo_server(local_server):
+    PhotoHandler.requests = []
+    return local_server(PhotoHandler)
+
+
+def write_catalog(site, rows):
+    with open(site.CATALOG_FILE, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(site.PRODUCT_COLUMNS)
+        for product_id, image_url in rows:
+            writer.writerow([product_id, f"Cake {product_id}", '₦5000', 'A cake', 'Saph', image_url, '@saph'])
+
+
+def build(site, incremental=False):
+    report = site.BuildReport()
+    site.create_final_website(incremental=incremental, report=report)
+    return report
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_variants_and_markup(site, photo_server):
+    write_catalog(site, [('1', photo_server + '/photo.jpg')])
+    build(site)
+
+    images = sorted(os.listdir(os.path.join('docs', 'images')))
+    names = {re.sub(r'^[0-9a-f]+-', '', name) for name in images}
+    assert names == {'thumb-120.webp', 'thumb-120.jpg', 'thumb-240.webp', 'thumb-240.jpg',
+                     'detail-480.webp', 'detail-480.jpg', 'detail-800.webp', 'detail-800.jpg'}
+    with Image.open(os.path.join('docs', 'images', next(name for name in images if 'thumb-240.jpg' in name))) as thumb:
+        assert thumb.size == (240, 240)
+
+    card = re.search(r'<picture>.*?</picture>', read(os.path.join('docs', 'index.html'))).group(0)
+    assert 'type="image/webp"' in card and '-thumb-120.webp 120w' in card and '-thumb-240.webp 240w' in card
+    assert 'width="120" height="120"' in card and 'loading="lazy"' in card
+
+    detail = re.search(r'<picture>.*?</picture>', read(os.path.join('docs', 'product-1.html'))).group(0)
+    assert '-detail-480.jpg 480w' in detail and 'width="480" height="360"' in detail
+    assert 'loading="lazy"' not in detail
+
+
+def test_revalidates_with_etag(site, photo_server, monkeypatch):
+    write_catalog(site, [('1', photo_server + '/photo.jpg')])
+    products = site.load_catalog()
+    site.start_build_report()
+    urls, entries, resized = site.cache_images(products, workers=1)
+    assert entries[0]['etag'] == '"v1"' and resized == 1
+
+    monkeypatch.setitem(site.IMAGE_SETTINGS, 'revalidate_after', 0)
+    urls, revalidated, resized = site.cache_images(products, workers=1)
+    assert PhotoHandler.requests[-1] == ('/photo.jpg', '"v1"')
+    assert revalidated[0]['content'] == entries[0]['content']
+    assert revalidated[0]['checked'] >= entries[0]['checked']
+    assert resized == 0
+
+
+def test_failed_fetch_keeps_remote_image(site, photo_server):
+    missing = photo_server + '/missing.jpg'
+    write_catalog(site, [('1', missing)])
+    report = build(site)
+
+    assert report.counters['image_fetch_failures'] == 1
+    assert f'<img src="{missing}"' in read(os.path.join('docs', 'product-1.html'))
+    assert not os.path.exists(os.path.join('docs', 'images'))
+
+
+def test_second_build_does_not_resize(site, photo_server):
+    write_catalog(site, [('1', photo_server + '/photo.jpg'), ('2', photo_server + '/photo.jpg')])
+    assert build(site).counters['images_resized'] == 1
+    requests = len(PhotoHandler.requests)
+
+    report = build(site, incremental=True)
+    assert report.counters['images_resized'] == 0
+    assert len(PhotoHandler.requests) == requests
+    assert report.counters['outputs_rebuilt'] == 0
@@ -0,0 +1,155 @@
+import asyncio
+import http.server
+import socket
+import threading
+import time
+
+import pytest
+
+
+class LinkHandler(http.server.BaseHTTPRequestHandler):
+    """Stand-in for the hosts the site links to
+
+    /ok/...      200
+    /missing/... 404
+    /nohead/...  405 for HEAD, 200 for GET
+    /redirect/n  302 to /redirect/n-1, then to /ok/
+    /loop        302 to itself
+    /slow/...    200 after a short delay
+    """
+    protocol_version = 'HTTP/1.1'
+    requests = []
+    in_flight = 0
+    most_in_flight = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def respond(self, body):
+        cls = type(self)
+        with cls.lock:
+            cls.requests.append((self.command, self.path, self.headers.get('Range')))
+            cls.in_flight += 1
+            cls.most_in_flight = max(cls.most_in_flight, cls.in_flight)
+        try:
+            status, headers = 200, {}
+            if self.path.startswith('/missing/'):
+                status = 404
+            elif self.path.startswith('/nohead/') and self.command == 'HEAD':
+                status = 405
+            elif self.path.startswith('/redirect/'):
+                hops = int(self.path.rsplit('/', 1)[1])
+                status, headers = 302, {'Location': f"/redirect/{hops - 1}" if hops > 1 else '/ok/'}
+            elif self.path == '/loop':
+                status, headers = 302, {'Location': '/loop'}
+            elif self.path.startswith('/slow/'):
+                time.sleep(0.05)
+            data = b'x' if status == 200 else b''
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            if body:
+                self.wfile.write(data)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def do_HEAD(self):
+        self.respond(False)
+
+    def do_GET(self):
+        self.respond(True)
+
+
+@pytest.fixture
+def link_server(local_server):
+    LinkHandler.requests = []
+    LinkHandler.most_in_flight = 0
+    return local_server(LinkHandler)
+
+
+@pytest.fixture
+def settings(site, tmp_path):
+    return {**site.LINK_CHECK_SETTINGS, 'cache_file': str(tmp_path / 'links.json'), 'timeout': 2}
+
+
+def check(site, settings, urls):
+    return asyncio.run(site.LinkChecker(settings).check(urls))
+
+
+def product(site, product_id, image_url, name='Cake'):
+    return site.Product(product_id, name, '₦5000', 'A cake', 'Saph', image_url, '@saph')
+
+
+def test_external_links_are_deduplicated(site, link_server):
+    photo = link_server + '/ok/cake.jpg'
+    products = [product(site, '1', photo, 'Red velvet'), product(site, '2', photo, 'Chin chin'),
+                product(site, '3', 'images/local.jpg')]
+    links = site.external_links(products)
+
+    assert links[photo] == ['1', '2']
+    whatsapp = [url for url in links if 'wa.me' in url]
+    assert whatsapp == [site.whatsapp_link()] and '?' not in whatsapp[0]
+    assert 'images/local.jpg' not in links
+
+
+def test_head_refused_falls_back_to_ranged_get(site, link_server, settings):
+    url = link_server + '/nohead/cake.jpg'
+    assert check(site, settings, [url]) == {url: {'status': 200}}
+    assert LinkHandler.requests == [('HEAD', '/nohead/cake.jpg', None), ('GET', '/nohead/cake.jpg', 'bytes=0-0')]
+
+
+def test_follows_redirects(site, link_server, settings):
+    results = check(site, settings, [link_server + '/redirect/3', link_server + '/loop'])
+    assert results[link_server + '/redirect/3'] == {'status': 200}
+    assert results[link_server + '/loop'] == {'status': None, 'error': 'too many redirects'}
+
+
+def test_unreachable_host(site, settings):
+    with socket.socket() as unused:
+        unused.bind(('127.0.0.1', 0))
+        port = unused.getsockname()[1]
+    url = f"http://127.0.0.1:{port}/cake.jpg"
+    result = check(site, settings, [url])[url]
+    assert result['status'] is None and result['error']
+    assert site.link_state(result) == 'unreachable'
+
+
+def test_per_host_concurrency_limit(site, link_server, settings):
+    settings['connections_per_host'] = 3
+    urls = [f"{link_server}/slow/{number}.jpg" for number in range(30)]
+    results = check(site, settings, urls)
+    assert all(result == {'status': 200} for result in results.values())
+    assert LinkHandler.most_in_flight == 3
+
+
+def test_cached_results_expire_after_their_ttl(site, link_server, settings, monkeypatch):
+    # Only check the stand-in server, not the business's real WhatsApp and Instagram links
+    all_links = site.external_links
+    monkeypatch.setattr(site, 'external_links', lambda products: {
+        url: ids for url, ids in all_links(products).items() if url.startswith(link_server)})
+    products = [product(site, '1', link_server + '/ok/1.jpg'), product(site, '2', link_server + '/missing/2.jpg')]
+
+    def run(**overrides):
+        LinkHandler.requests = []
+        report = site.start_build_report()
+        results = site.check_external_links(products, {**settings, **overrides})
+        return results, report, sorted(path for method, path, range_header in LinkHandler.requests)
+
+    results, report, requests = run()
+    assert [site.link_state(result) for result in results.values()] == ['ok', 'broken']
+    assert report.details['links'][0]['products'] == ['2']
+    assert requests == ['/missing/2.jpg', '/ok/1.jpg']
+
+    results, report, requests = run()
+    assert requests == [] and report.counters['links_probed'] == 0
+    assert report.counters['links_failing'] == 1
+
+    results, report, requests = run(failure_ttl=0)
+    assert requests == ['/missing/2.jpg']
+
+    results, report, requests = run(ttl=0)
+    assert requests == ['/ok/1.jpg']
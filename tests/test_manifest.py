@@ -0,0 +1,71 @@
+import csv
+import os
+
+import pytest
+
+
+def write_catalog(site, rows):
+    with open(site.CATALOG_FILE, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(site.PRODUCT_COLUMNS)
+        writer.writerows(rows)
+
+
+def catalog_rows(count=20):
+    return [[str(100 + number), f"Cake {number}", f"₦{1000 + number * 100}", 'A cake', 'Saph', '', '@saph']
+            for number in range(count)]
+
+
+def build(site, **options):
+    report = site.BuildReport()
+    site.create_final_website(images=False, report=report, **options)
+    return report
+
+
+def written(report):
+    return {record['path'] for record in report.files}
+
+
+@pytest.fixture
+def built(site):
+    rows = catalog_rows()
+    write_catalog(site, rows)
+    build(site)
+    return rows
+
+
+def test_one_row_edit_rebuilds_only_its_pages(site, built):
+    built[5][2] = '₦9999'
+    write_catalog(site, built)
+    report = build(site, incremental=True)
+
+    products = site.load_catalog()
+    edited = products[5]
+    expected = {f"product-{edited.product_id}.html"} | {
+        f"product-{product.product_id}.html" for position, product in enumerate(products)
+        if edited in site.get_other_products(product, products, position)}
+    product_pages = {path for path in written(report) if path.startswith('product-') and path.endswith('.html')}
+    assert product_pages == expected
+    assert not any(path.startswith('qr-') for path in written(report))
+    short_links = {path for path in written(report) if path.startswith(('p/', 'o/')) and path.endswith('.html')}
+    assert short_links == {f"p/{edited.product_id}.html", f"o/{edited.product_id}.html"}
+    assert report.counters['outputs_unchanged'] > report.counters['outputs_rebuilt']
+
+
+def test_removed_product_files_are_deleted(site, built):
+    removed = built.pop(3)[0]
+    write_catalog(site, built)
+    report = build(site, incremental=True)
+
+    for filename in (f"product-{removed}.html", f"qr-{removed}.png", f"p/{removed}.html", f"o/{removed}.html"):
+        assert not os.path.exists(os.path.join('docs', filename))
+    assert report.counters['outputs_removed'] >= 4
+    assert os.path.exists(os.path.join('docs', f"product-{built[3][0]}.html"))
+
+
+def test_options_change_rebuilds_everything(site, built):
+    assert build(site, incremental=True).counters['outputs_rebuilt'] == 0
+
+    report = build(site, incremental=True, asset_settings={'compress': False})
+    assert report.counters['outputs_unchanged'] == 0
+    assert not os.path.exists(os.path.join('docs', 'index.html.gz'))